@@ -0,0 +1,153 @@
+from collections import namedtuple
+
+from layout import BoardLayout, FrozenDict
+from tile import Action
+
+
+class LegalActions(namedtuple(
+        'LegalActions', ['ids', 'actions', 'costs', 'mask'])):
+    """
+    Legal actions of a tile in a given state, in the order of
+    Tile.get_action. ids index ActionSpace.actions, costs is the cash each
+    action needs and mask has the bit of each id set
+    """
+    __slots__ = ()
+
+    def id_of(self, action: tuple) -> int:
+        """
+        Id of one of the legal actions
+        """
+        return self.ids[self.actions.index(action)]
+
+
+# Action spaces keyed by id of the layout. Layouts are shared by schemas of
+# the same content, so the id stands for the content. The layout is held
+# alongside the action space so that its id cannot be reused by another object
+_SPACE_CACHE = {}
+_SPACE_CACHE_SIZE = 128
+
+
+class ActionSpace:
+    """
+    Every optional action of a board schema, numbered once. Id 0 is do
+    nothing, followed by the actions on each purchasable tile: acquire,
+    liquidate_title and, on properties, selling and adding houses and hotels.
+    Action tuples are built once, with read-only params, and shared by every
+    board of the layout. The legal actions of each tile state are tabled on
+    first use, so landing on a tile allocates nothing unless the player
+    cannot afford some of the actions
+    """
+    def __init__(self, layout: BoardLayout) -> None:
+        self.layout = layout
+
+        self.actions = [Action(None, FrozenDict())]
+        self.tiles = [None]
+        # Id of each action on a tile, keyed by (idx, action, type, amt)
+        self.index = {}
+        for idx in layout.purchasable:
+            keys = [('acquire', None, 0), ('liquidate_title', None, 0)]
+            if layout.kinds[idx] == 'property':
+                keys += [('sell_construct', 'house', i) for i in range(1, 4)]
+                keys += [('add_construct', 'house', i) for i in range(1, 5)]
+                keys += [
+                    ('add_construct', 'hotel', 1),
+                    ('sell_construct', 'hotel', 1)]
+
+            for action, contype, amt in keys:
+                params = {'type': contype, 'amt': amt} if contype else {}
+                self.index[(idx, action, contype, amt)] = len(self.actions)
+                self.actions.append(Action(action, FrozenDict(params)))
+                self.tiles.append(idx)
+
+        self.actions = tuple(self.actions)
+        self.tiles = tuple(self.tiles)
+        self.nothing = LegalActions((0,), (self.actions[0],), (0,), 1)
+
+        self._legal = {}
+        self._pay = {}
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def pay(self, owner: str) -> tuple:
+        """
+        Rent payment to the owner of a tile
+        """
+        if owner not in self._pay:
+            self._pay[owner] = Action('pay', FrozenDict(payee=owner))
+
+        return self._pay[owner]
+
+    def table(self, idx: int, owned: bool, house: int=0,
+            hotel: int=0) -> LegalActions:
+        """
+        Legal actions on the purchasable tile for the player landing on it,
+        before affordability. owned is True if the player holds the tile
+        """
+        key = (idx, owned, house, hotel)
+        if key in self._legal:
+            return self._legal[key]
+
+        keys = [] if owned else [('acquire', None, 0)]
+        if owned:
+            keys.append(('liquidate_title', None, 0))
+            if self.layout.kinds[idx] == 'property':
+                # Same rules as TileProperty.get_action
+                if house < 4:
+                    keys += [
+                        ('sell_construct', 'house', i)
+                        for i in range(1, house + 1)]
+                    keys += [
+                        ('add_construct', 'house', i)
+                        for i in range(1, 5 - house)]
+                if house == 4 and not hotel:
+                    keys.append(('add_construct', 'hotel', 1))
+                elif hotel:
+                    keys.append(('sell_construct', 'hotel', 1))
+
+        cost = self.layout.specs[idx]['cost']
+        ids = (0,) + tuple(self.index[(idx,) + k] for k in keys)
+        costs = (0,) + tuple(
+            cost['title'] if k[0] == 'acquire' else
+            cost[k[1]] * k[2] if k[0] == 'add_construct' else 0
+            for k in keys)
+        legal = LegalActions(
+            ids, tuple(self.actions[i] for i in ids), costs,
+            sum(1 << i for i in ids))
+        self._legal[key] = legal
+
+        return legal
+
+    def legal(self, tile, token: str, balance: int) -> LegalActions:
+        """
+        Legal actions on the purchasable tile for the player landing on it
+        with the balance
+        """
+        legal = self.table(
+            tile.idx, tile.owner == token, getattr(tile, 'house', 0),
+            getattr(tile, 'hotel', 0))
+        if balance >= max(legal.costs):
+            return legal
+
+        keep = [k for k, c in enumerate(legal.costs) if c <= balance]
+        ids = tuple(legal.ids[k] for k in keep)
+
+        return LegalActions(
+            ids, tuple(legal.actions[k] for k in keep),
+            tuple(legal.costs[k] for k in keep), sum(1 << i for i in ids))
+
+
+def get_action_space(layout: BoardLayout) -> ActionSpace:
+    """
+    Action space of the layout, built once per layout object
+    """
+    cached = _SPACE_CACHE.get(id(layout))
+    if cached is not None and cached[0] is layout:
+        return cached[1]
+
+    space = ActionSpace(layout)
+    if len(_SPACE_CACHE) >= _SPACE_CACHE_SIZE:
+        _SPACE_CACHE.clear()
+    _SPACE_CACHE[id(layout)] = (layout, space)
+
+    return space
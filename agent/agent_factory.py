@@ -1,8 +1,14 @@
 from agent.default_agent import NaiveAgent
+from agent.mcts_agent import MonteCarloAgent
 from agent.metaclass import Agent
+from agent.replay_agent import ReplayAgent
 
-def create_player_agent(agent: str, token: str) -> "Agent":
+def create_player_agent(agent: str, token: str, **kwargs) -> "Agent":
     if agent == 'default':
         agent = NaiveAgent
+    elif agent == 'mcts':
+        agent = MonteCarloAgent
+    elif agent == 'replay':
+        agent = ReplayAgent
 
-    return Agent(agent=agent, token=token)
\ No newline at end of file
+    return Agent(agent=agent, token=token, **kwargs)
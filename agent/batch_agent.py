@@ -0,0 +1,69 @@
+from typing import List, Optional
+
+import numpy as np
+
+from agent.metaclass import AbstractBatchAgent
+
+
+# Kinds of the actions returned by Tile.get_action, None being do nothing
+ACTION_KINDS = (
+    None, 'acquire', 'add_construct', 'liquidate_title', 'sell_construct')
+KIND_INDEX = {kind: i for i, kind in enumerate(ACTION_KINDS)}
+
+# Features of a decision, from the point of view of the deciding player
+DECISION_FEATURES = (
+    'bias', 'balance', 'title_cost', 'group_owned', 'assets', 'jail_free')
+
+
+def decision_features(
+        board, player, tile, out: Optional[np.ndarray]=None) -> np.ndarray:
+    """
+    Feature vector of the decision of the player on the tile. Money is
+    scaled by the starting balance. Written into out, if given
+    """
+    if out is None:
+        out = np.empty(len(DECISION_FEATURES), dtype=np.float32)
+
+    color = getattr(tile, 'color', None)
+    group = board.layout.groups.get(color, ())
+    cost = getattr(tile, 'cost', None)
+
+    out[0] = 1.
+    out[1] = player.balance / 1500
+    out[2] = cost['title'] / 1500 if cost else 0.
+    out[3] = board.ownership.count(color, player.token) / len(group) \
+        if group else 0.
+    out[4] = sum(len(v) for v in player.assets.values()) / \
+        len(board.layout.purchasable)
+    out[5] = player.favors['jail-free']
+
+    return out
+
+
+class LinearBatchAgent(AbstractBatchAgent):
+    """
+    Scores every legal action of a batch of decisions in one vectorized pass.
+    The score of an action is the dot product of the decision features with
+    the weights of its kind, and the best scoring action is chosen. Ties go
+    to the first action
+    """
+    def __init__(self, weights: Optional[np.ndarray]=None) -> None:
+        if weights is None:
+            weights = np.zeros(
+                (len(ACTION_KINDS), len(DECISION_FEATURES)), dtype=np.float32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+
+    def cp_take_actions(
+            self, lst_decisions: List[list], features: np.ndarray
+            ) -> np.ndarray:
+        width = max(len(lst) for lst in lst_decisions)
+        kinds = np.full((len(lst_decisions), width), -1, dtype=np.intp)
+        for k, lst_action in enumerate(lst_decisions):
+            kinds[k, :len(lst_action)] = [
+                KIND_INDEX[a.action] for a in lst_action]
+
+        # (K, A, F) weights of each action against (K, F) features
+        scores = np.einsum('kaf,kf->ka', self.weights[kinds], features)
+        scores[kinds < 0] = -np.inf
+
+        return scores.argmax(axis=1)
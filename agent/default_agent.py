@@ -3,6 +3,7 @@ import itertools
 from collections import namedtuple
 from typing import List, Tuple
 
+from agent.liquidation import min_surplus_subset
 from agent.metaclass import Agent
 from tile import Tile
 
@@ -16,24 +17,7 @@ class NaiveAgent(Agent):
         lst = [(getattr(x, 'idx'), getattr(x, 'cost').get('title')) \
             for x in lst]
 
-        # Iterate from 1 and sequentially increased until the proceeds from the
-        # sale is greater than the amount
-        i = 1
-        surplus = float('inf')
-        combi = None
-        while i <= len(lst):
-            cbn = itertools.combinations(lst, i)
-
-            for grp in cbn:
-                diff = sum([x[1] for x in grp]) - amt
-
-                if diff >= 0 and diff < surplus:
-                    surplus = diff
-                    combi = tuple([x[0] for x in grp])
-
-            i += 1
-
-        return None if not combi else combi
+        return min_surplus_subset(lst, amt)
 
     def cp_take_action(self, lst_action: List) -> int:
         """
@@ -0,0 +1,62 @@
+import itertools
+
+from typing import Optional, Sequence, Tuple
+
+
+def exhaustive_min_surplus(
+        lst: Sequence[Tuple[int, int]], amt: float) -> Optional[tuple]:
+    """
+    Reference search over every combination of assets. lst holds the
+    (idx, value) of each asset. Returns the idx of the assets whose total value
+    covers amt with the least surplus, preferring fewer assets and then the
+    earliest combination in lst. Returns None if amt cannot be covered
+    """
+    # Iterate from 1 and sequentially increased until the proceeds from the
+    # sale is greater than the amount
+    i = 1
+    surplus = float('inf')
+    combi = None
+    while i <= len(lst):
+        cbn = itertools.combinations(lst, i)
+
+        for grp in cbn:
+            diff = sum([x[1] for x in grp]) - amt
+
+            if diff >= 0 and diff < surplus:
+                surplus = diff
+                combi = tuple([x[0] for x in grp])
+
+        i += 1
+
+    return combi
+
+
+def min_surplus_subset(
+        lst: Sequence[Tuple[int, int]], amt: float) -> Optional[tuple]:
+    """
+    Dynamic programming equivalent of exhaustive_min_surplus, with the same
+    tie-breaking. Subsets are tracked by their total value, keeping only the
+    best (count, positions) per total. Totals that already cover amt are never
+    extended since adding assets only increases the surplus
+    """
+    # Total value -> (number of assets, positions in lst) of the best subset
+    # that does not cover amt yet
+    partial = {0: (0, ())}
+    best = None
+    for pos, (_, value) in enumerate(lst):
+        for total, (count, positions) in list(partial.items()):
+            candidate = (total + value, count + 1, positions + (pos,))
+
+            if candidate[0] >= amt:
+                if best is None or candidate < best:
+                    best = candidate
+                continue
+
+            current = partial.get(candidate[0])
+            if current is None or candidate[1:] < current:
+                partial[candidate[0]] = candidate[1:]
+
+    if best is None:
+        return None
+
+    return tuple(lst[pos][0] for pos in best[2])
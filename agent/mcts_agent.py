@@ -0,0 +1,214 @@
+import itertools
+import math
+import time
+
+from typing import Callable, List, Optional, Tuple
+
+from agent.default_agent import NaiveAgent
+from agent.liquidation import min_surplus_subset
+
+
+def naive_policy(agent, lst_action: List) -> tuple:
+    """
+    Rollout policy that plays the NaiveAgent strategy
+    """
+    return NaiveAgent.cp_take_action(agent, lst_action)
+
+
+def random_policy(agent, lst_action: List) -> tuple:
+    """
+    Rollout policy that picks any available action
+    """
+    return agent.board.rng.choice(lst_action)
+
+
+ROLLOUT_POLICIES = {'naive': naive_policy, 'random': random_policy}
+
+
+class Node:
+    """
+    Decision node. Holds the visit count and total reward of each choice
+    """
+    __slots__ = ('visits', 'rewards')
+
+    def __init__(self, n_choices: int):
+        self.visits = [0] * n_choices
+        self.rewards = [0.] * n_choices
+
+    def select(self, exploration: float) -> int:
+        """
+        Pick the next choice to simulate by UCB1. Unvisited choices go first
+        """
+        for i, n in enumerate(self.visits):
+            if not n:
+                return i
+
+        log_total = math.log(sum(self.visits))
+        return max(range(len(self.visits)), key=lambda i:
+            self.rewards[i] / self.visits[i] +
+            exploration * math.sqrt(log_total / self.visits[i]))
+
+    def best(self) -> int:
+        """
+        The most visited choice
+        """
+        return max(range(len(self.visits)), key=lambda i:
+            (self.visits[i], self.rewards[i]))
+
+
+class MonteCarloAgent(NaiveAgent):
+    """
+    Flat Monte Carlo search agent. Each decision plays out rollouts from the
+    current board for every available choice, picking choices by UCB1 until
+    the iteration or time budget runs out. Only the choices of the decision
+    are scored: the turns that follow are played by the rollout policy, and
+    nothing is kept from one decision to the next
+    Options:
+        iterations: number of rollouts per decision
+        time_budget: seconds per decision. Stops early once exceeded
+        rollout_depth: number of turns played out per rollout
+        rollout_policy: 'naive', 'random' or a callable(agent, lst_action)
+        exploration: UCB1 exploration constant
+    """
+    def __init__(
+            self, iterations: int=64, time_budget: Optional[float]=None,
+            rollout_depth: int=40, rollout_policy='naive',
+            exploration: float=1.4, **kwargs) -> None:
+        super().__init__(**kwargs)
+
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.rollout_depth = rollout_depth
+        self.rollout_policy = ROLLOUT_POLICIES.get(
+            rollout_policy, rollout_policy)
+        self.exploration = exploration
+
+        # Statistics of the last decision
+        self.node = None
+
+        # Latency of the decisions made so far
+        self.decisions = 0
+        self.total_latency = 0.
+        self.max_latency = 0.
+        self.over_budget = 0
+
+    @property
+    def latency(self) -> dict:
+        """
+        Report the time spent per decision against the time budget
+        """
+        return {
+            'budget': self.time_budget,
+            'decisions': self.decisions,
+            'mean': self.total_latency / self.decisions
+                if self.decisions else 0.,
+            'max': self.max_latency,
+            'over_budget': self.over_budget
+        }
+
+    def evaluate(self) -> float:
+        """
+        Reward of the current board to this agent: its share of the net worth
+        of the players still in the game
+        """
+        if self.bankrupt:
+            return 0.
+
+        worth = {p.token: max(p.balance, 0) + sum(
+            t.cost['title'] for t in itertools.chain(*p.assets.values()))
+            for p in self.board.solvent}
+        total = sum(worth.values())
+
+        return worth[self.token] / total if total else 0.
+
+    def rollout(self) -> float:
+        """
+        Play out the game from the current board with the rollout policy
+        """
+        for _ in range(self.rollout_depth):
+            if self.board.is_over:
+                break
+            self.board.play_next_turn()
+
+        return self.evaluate()
+
+    def search(self, choices: List[Callable]) -> int:
+        """
+        Simulate each choice within the budget and return the index of the
+        best one. A choice is a function applying the decision to the board
+        """
+        if len(choices) == 1:
+            return 0
+
+        node = self.node = Node(len(choices))
+
+        board = self.board
+        snapshot = board.snapshot()
+        start = time.perf_counter()
+        board.in_rollout = True
+        try:
+            for i in range(self.iterations):
+                if self.time_budget is not None and i >= len(choices) and \
+                        time.perf_counter() - start >= self.time_budget:
+                    break
+
+                choice = node.select(self.exploration)
+                choices[choice]()
+                node.visits[choice] += 1
+                node.rewards[choice] += self.rollout()
+                board.restore(snapshot, rng=False)
+        finally:
+            board.in_rollout = False
+            # Leave the random number generator as if no search took place
+            board.restore(snapshot)
+
+        latency = time.perf_counter() - start
+        self.decisions += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        if self.time_budget is not None and latency > self.time_budget:
+            self.over_budget += 1
+
+        return node.best()
+
+    def cp_take_action(self, lst_action: List) -> tuple:
+        """
+        Pick the action with the best simulated outcome
+        """
+        if self.board is None or self.board.in_rollout:
+            return self.rollout_policy(self, lst_action)
+
+        board = self.board
+        tile = board.lst_tile[board.player_location[self.token]]
+        choices = [
+            lambda a=a: board.complete_turn(tile, self, a)
+            for a in lst_action]
+
+        return lst_action[self.search(choices)]
+
+    def cp_asset_sale(self, amt: float) -> Tuple:
+        """
+        Pick the liquidation with the best simulated outcome. Candidates are
+        the least-surplus sale and the least-surplus sale keeping each of the
+        assets held
+        """
+        default = super().cp_asset_sale(amt)
+        if self.board is None or self.board.in_rollout or default is None:
+            return default
+
+        lst = [(x.idx, x.cost['title'])
+            for x in itertools.chain(*self.assets.values())]
+        candidates = [default]
+        for i in range(len(lst)):
+            sale = min_surplus_subset(lst[:i] + lst[i + 1:], amt)
+            if sale is not None and sale not in candidates:
+                candidates.append(sale)
+
+        board = self.board
+        def sell(sale):
+            for idx in sale:
+                board.player_sell(board.lst_tile[idx], self)
+
+        choices = [lambda sale=sale: sell(sale) for sale in candidates]
+
+        return candidates[self.search(choices)]
@@ -1,4 +1,5 @@
 import abc
+import asyncio
 
 from player import Player
 
@@ -15,14 +16,66 @@ class AbstractAgent(metaclass=abc.ABCMeta):
         raise NotImplementedError
 
 
+class AbstractAsyncAgent(metaclass=abc.ABCMeta):
+    """
+    Awaitable counterpart of the Agent decisions, for agents that wait on
+    slow work (models, remote players) without blocking other games. Only
+    the choice of action is awaited: assets are liquidated while the turn is
+    resolved, by the synchronous cp_asset_sale
+    """
+    @abc.abstractmethod
+    async def acp_take_action(self, lst_action: list) -> tuple:
+        """
+        Pick one of the actions
+        """
+        raise NotImplementedError
+
+
+class AbstractBatchAgent(metaclass=abc.ABCMeta):
+    """
+    Agent deciding for many games in one call
+    """
+    @abc.abstractmethod
+    def cp_take_actions(self, lst_decisions: list, features) -> list:
+        """
+        Pick one action per decision. lst_decisions holds the list of legal
+        actions of each decision and row k of features describes decision k.
+        Returns the index of the chosen action of each decision
+        """
+        raise NotImplementedError
+
+
 class BaseAgent(AbstractAgent):
-    pass
+    """
+    Awaitable decisions default to the synchronous ones. They run in the
+    executor of the agent, if any, and inline otherwise
+    """
+    executor = None
+
+    async def _decide(self, decision, *args):
+        if self.executor is None:
+            return decision(*args)
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, decision, *args)
+
+    async def acp_take_action(self, lst_action: list) -> tuple:
+        return await self._decide(self.cp_take_action, lst_action)
+
+
+AbstractAsyncAgent.register(BaseAgent)
 
 
 class Agent(Player, BaseAgent):
     def __new__(cls, **kwargs) -> "Agent":
-        agent = kwargs['agent']
+        # Unpickling creates the agent without arguments
+        agent = kwargs.get('agent', cls)
         return super(Agent, agent).__new__(agent)
 
     def __init__(self, **kwargs) -> None:
-        super().__init__(kwargs['token'])
\ No newline at end of file
+        super().__init__(kwargs['token'])
+        # The board this agent is playing on. Set by the Board
+        self.board = None
+        # Executor the awaitable decisions run in, e.g. a thread pool for
+        # agents that release the GIL while deciding
+        self.executor = kwargs.get('executor')
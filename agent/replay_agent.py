@@ -0,0 +1,76 @@
+from typing import List, Optional, Tuple
+
+from agent.default_agent import NaiveAgent
+
+
+class ReplayAgent(NaiveAgent):
+    """
+    Agent that repeats the decisions recorded in an event log instead of
+    making its own. decisions maps a turn to the (event, tile idx, amount)
+    of the buy, sell, house and hotel events of this player in that turn, in
+    the order they were logged
+    """
+    def __init__(self, decisions: Optional[dict]=None, **kwargs) -> None:
+        super().__init__(**kwargs)
+
+        self.decisions = decisions or {}
+        # Turn whose decisions are being replayed and the next one to take
+        self._turn = None
+        self._next = 0
+
+    def rewind(self) -> None:
+        """
+        Forget the decisions taken so far, e.g. after the board is restored
+        """
+        self._turn = None
+        self._next = 0
+
+    def _pending(self) -> List[tuple]:
+        """
+        Decisions of the current turn not taken yet
+        """
+        if self._turn != self.board.nturn:
+            self._turn = self.board.nturn
+            self._next = 0
+
+        return self.decisions.get(self._turn, [])[self._next:]
+
+    def cp_take_action(self, lst_action: List) -> tuple:
+        """
+        Take the recorded decision if it matches one of the actions, else do
+        nothing
+        """
+        pending = self._pending()
+        if not pending:
+            return lst_action[0]
+
+        event, idx, amount = pending[0]
+        tile = self.board.lst_tile[self.board.player_location[self.token]]
+        if getattr(tile, 'idx', None) != idx:
+            return lst_action[0]
+
+        for action in lst_action:
+            if (event, action.action) in (
+                    ('buy', 'acquire'), ('sell', 'liquidate_title')) or (
+                    action.action == 'add_construct' and
+                    action.params['type'] == event and
+                    action.params['amt'] == amount):
+                self._next += 1
+                return action
+
+        return lst_action[0]
+
+    def cp_asset_sale(self, amt: float) -> Tuple:
+        """
+        Sell the recorded tiles in order until the shortfall is covered
+        """
+        sale = []
+        for event, idx, value in self._pending():
+            if event != 'sell' or amt <= 0:
+                break
+            sale.append(idx)
+            amt -= value
+
+        self._next += len(sale)
+
+        return tuple(sale)
@@ -0,0 +1,258 @@
+"""
+Time the hot paths of the engine with fixed seeds and write the results as
+JSON, to compare against the results of an earlier commit
+
+    python -m benchmarks.bench_hotpaths --output bench.json
+    python -m benchmarks.bench_hotpaths --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+import board
+import simulation
+import tile
+
+from board import allocate_sequence_ownership
+from common import DATADIR
+
+
+LST_TOKEN = ['apple', 'boot', 'car', 'dog']
+
+
+def load_schema() -> dict:
+    with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+        return json.load(f)
+
+
+def measure(func, number: int, repeat: int) -> dict:
+    """
+    Time number calls of func, repeat times. Times are per call, in seconds
+    """
+    times = [t / number for t in timeit.repeat(
+        func, number=number, repeat=repeat)]
+
+    return {
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.mean(times),
+        'stddev': statistics.stdev(times) if len(times) > 1 else 0.,
+        'ops': 1 / min(times),
+        'number': number,
+        'repeat': repeat
+    }
+
+
+def bench_dice(seed: int) -> dict:
+    dice = board.Dice('hexa', 2, rng=random.Random(seed))
+
+    def distribution():
+        board._DISTRIBUTION_CACHE.clear()
+        dice.generate_distribution()
+
+    return {
+        'dice_roll': (dice.roll, 100000),
+        'dice_generate_distribution': (distribution, 200),
+        'dice_generate_distribution_cached': (
+            dice.generate_distribution, 100000)
+    }
+
+
+def bench_board(seed: int) -> dict:
+    schema = load_schema()
+    gameboard = board.Board(LST_TOKEN, schema, seed=seed)
+    start = gameboard.snapshot()
+
+    def build_board():
+        gameboard.lst_tile = []
+        gameboard.build_board()
+
+    def play_next_turn():
+        if gameboard.is_over or gameboard.nturn >= 500:
+            gameboard.restore(start)
+        gameboard.play_next_turn()
+
+    # Terrain values on an owned board, without the cache
+    terrain_board = allocate_sequence_ownership(
+        board.Board(LST_TOKEN, schema, seed=seed))
+    apple = terrain_board.players['apple']
+
+    def terrain_value():
+        terrain_board._terrain_cache[
+            terrain_board.player_location['apple']].clear()
+        terrain_board.calculate_terrain_value(apple)
+
+    deck = tile.TileChance(rng=random.Random(seed))
+
+    return {
+        'board_init': (
+            lambda: board.Board(LST_TOKEN, schema, seed=seed), 500),
+        'board_build_board': (build_board, 1000),
+        'board_play_next_turn': (play_next_turn, 5000),
+        'board_calculate_terrain_value': (terrain_value, 10000),
+        'deck_get_action': (deck.get_action, 100000)
+    }
+
+
+def bench_asset_sale(seed: int) -> dict:
+    """
+    NaiveAgent.cp_asset_sale with 4 to 28 assets held, for a shortfall of
+    about half their value
+    """
+    rng = random.Random(seed)
+    schema = load_schema()
+    benches = {}
+    for n in range(4, 29, 8):
+        gameboard = board.Board(LST_TOKEN, schema, seed=seed)
+        apple = gameboard.players['apple']
+        tiles = [gameboard.lst_tile[i] for i in rng.sample(
+            gameboard.layout.purchasable, n)]
+        for t in tiles:
+            gameboard.player_buy(t, apple)
+        amt = sum(t.cost['title'] for t in tiles) // 2 + 50
+
+        benches[f'naive_cp_asset_sale_{n}'] = (
+            lambda apple=apple, amt=amt: apple.cp_asset_sale(amt), 20)
+
+    return benches
+
+
+def bench_games(seed: int, n_games: int=50) -> dict:
+    """
+    Throughput of full games played to completion
+    """
+    schema = load_schema()
+    start = time.perf_counter()
+    turns = 0
+    for i in range(n_games):
+        turns += simulation.play_game(
+            LST_TOKEN, schema, seed + i, max_turns=1000).turns
+    elapsed = time.perf_counter() - start
+
+    return {
+        'games': n_games,
+        'turns': turns,
+        'seconds': elapsed,
+        'games_per_sec': n_games / elapsed,
+        'turns_per_sec': turns / elapsed
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run(seed: int=0, repeat: int=5, quick: bool=False) -> dict:
+    """
+    Run all benchmarks. quick scales the number of calls down by 10, for a
+    smoke test
+    """
+    benches = {}
+    for group in (bench_dice, bench_board, bench_asset_sale):
+        benches.update(group(seed))
+
+    results = {}
+    for name, (func, number) in benches.items():
+        number = max(1, number // 10) if quick else number
+        results[name] = measure(func, number, repeat)
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'seed': seed,
+            'repeat': repeat
+        },
+        'benchmarks': results,
+        'throughput': bench_games(seed, 5 if quick else 50)
+    }
+
+
+# Throughput metrics, where a drop is a regression
+RATES = ('games_per_sec', 'turns_per_sec')
+
+
+def compare(results: dict, baseline: dict, threshold: float=0.1) -> list:
+    """
+    Benchmarks slower than in the baseline by more than threshold, as
+    (name, baseline, result, ratio). Ratios are of the slowdown: time over
+    baseline time for the benchmarks, baseline rate over rate for throughput
+    """
+    slower = []
+    for name, stats in results['benchmarks'].items():
+        if name not in baseline['benchmarks']:
+            continue
+        before = baseline['benchmarks'][name]['min']
+        ratio = stats['min'] / before
+        if ratio > 1 + threshold:
+            slower.append((name, before, stats['min'], ratio))
+
+    for name in RATES:
+        before = baseline.get('throughput', {}).get(name)
+        if not before:
+            continue
+        after = results['throughput'][name]
+        ratio = before / after
+        if ratio > 1 + threshold:
+            slower.append((name, before, after, ratio))
+
+    return slower
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--output', help='write the results to this file')
+    parser.add_argument('--compare', help='results of an earlier run')
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help='slowdown ratio reported as a regression')
+    args = parser.parse_args()
+
+    results = run(args.seed, args.repeat, args.quick)
+
+    print(f'{"benchmark":<36} {"min (us)":>12} {"median (us)":>12}')
+    for name, stats in results['benchmarks'].items():
+        print(f'{name:<36} {stats["min"] * 1e6:>12.2f} '
+            f'{stats["median"] * 1e6:>12.2f}')
+    throughput = results['throughput']
+    print(f'{throughput["games_per_sec"]:.1f} games/s, '
+        f'{throughput["turns_per_sec"]:.0f} turns/s')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            slower = compare(results, json.load(f), args.threshold)
+        for name, before, after, ratio in slower:
+            if name in RATES:
+                print(f'REGRESSION {name}: {before:.1f} -> {after:.1f} '
+                    f'({ratio:.2f}x slower)')
+            else:
+                print(f'REGRESSION {name}: {before * 1e6:.2f}us -> '
+                    f'{after * 1e6:.2f}us ({ratio:.2f}x)')
+        return int(bool(slower))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
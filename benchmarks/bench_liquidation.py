@@ -0,0 +1,56 @@
+"""
+Compare the knapsack liquidation solver against the exhaustive combinations
+search it replaced, at increasing numbers of owned assets
+
+    python -m benchmarks.bench_liquidation
+"""
+import json
+import os
+import random
+import timeit
+
+from agent.liquidation import exhaustive_min_surplus, min_surplus_subset
+from common import DATADIR
+
+
+# The exhaustive search doubles in cost with every asset. Stop timing it here
+MAX_EXHAUSTIVE = 18
+
+
+def purchasable_assets() -> list:
+    """
+    The (idx, title cost) of every purchasable tile on the board
+    """
+    with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+        schema = json.load(f)
+
+    return [(v['idx'], v['cost']['title'])
+        for v in schema['board-sg'].values() if 'cost' in v]
+
+
+def main(seed: int=0, repeat: int=3) -> None:
+    rng = random.Random(seed)
+    assets = purchasable_assets()
+
+    print(f'{"assets":>6} {"exhaustive (s)":>15} {"knapsack (s)":>13}')
+    for n in range(4, len(assets) + 1, 2):
+        lst = rng.sample(assets, n)
+        # Shortfall of about half the value of the assets held
+        amt = sum(x[1] for x in lst) // 2 + 50
+
+        t_knapsack = min(timeit.repeat(
+            lambda: min_surplus_subset(lst, amt), number=1, repeat=repeat))
+
+        t_exhaustive = float('nan')
+        if n <= MAX_EXHAUSTIVE:
+            t_exhaustive = min(timeit.repeat(
+                lambda: exhaustive_min_surplus(lst, amt),
+                number=1, repeat=repeat))
+            assert exhaustive_min_surplus(lst, amt) == \
+                min_surplus_subset(lst, amt)
+
+        print(f'{n:>6} {t_exhaustive:>15.6f} {t_knapsack:>13.6f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,39 +1,115 @@
 from agent.agent_factory import create_player_agent
 import random
 
-from collections import Counter
 from collections.abc import Callable
-from itertools import chain, cycle, product, zip_longest
-from typing import List, Sequence
+from collections import defaultdict, namedtuple
+from itertools import chain, zip_longest
+from typing import List, Optional, Sequence
 
 import agent
 import player
 import tile
+from actionspace import get_action_space
+from cards import resolve_card
+from common import dice_faces
+from layout import BoardLayout, compile_layout
+from ownership import OwnershipIndex
 from player import Player
-from tile import Tile, TileFactory
+from tile import Tile, TileFactory, TilePurchasable
 
 
 class ItemCycler:
     def __init__(self, lst_items: list):
-        self.roll = cycle(lst_items)
+        self.items = lst_items
+        # Index of the next item to be issued
+        self.pointer = 0
 
     def issue_next(self) -> Player:
-        return next(self.roll)
+        item = self.items[self.pointer]
+        self.pointer = (self.pointer + 1) % len(self.items)
+        return item
+
+
+# Mutable state of a Board. Tile columns are indexed by tile idx and player
+# columns by the order of Board.players. Owners are stored as the player index,
+# with -1 for the bank. assets holds the (color, tile idx) lists of each
+# player in the order the player holds them, and legal the LegalActions of
+# the last landing
+BoardSnapshot = namedtuple('BoardSnapshot', [
+    'owner', 'house', 'hotel', 'position', 'nround', 'balance', 'jail',
+    'bankrupt', 'jail_free', 'assets', 'decks', 'turn', 'nturn', 'legal',
+    'rng'])
+
+
+# Outcome distributions shared by all Dice instances in this process. Keyed by
+# (faces, dice count, rerolls, strike)
+_DISTRIBUTION_CACHE = {}
+
+
+def _convolve(one: dict, two: dict) -> dict:
+    """
+    Distribution of the sum of two independent outcomes
+    """
+    outcome = {}
+    for k1, p1 in one.items():
+        for k2, p2 in two.items():
+            outcome[k1 + k2] = outcome.get(k1 + k2, 0) + p1 * p2
+
+    return outcome
+
+
+def outcome_distribution(
+        faces: int, n: int=2, rerolls: int=2, strike: bool=False) -> dict:
+    """
+    Returns the distribution of the total steps from one turn of n dice with
+    the given number of faces. Doubles (all dice showing the same face) earn a
+    reroll, up to the given number of rerolls. The last roll is a regular roll
+    unless strike is set, in which case doubles on the last roll send the
+    player to jail and are left out of the distribution
+    """
+    key = (faces, n, rerolls, strike)
+    if key in _DISTRIBUTION_CACHE:
+        return _DISTRIBUTION_CACHE[key]
+
+    # Sum of a single roll, built up one die at a time
+    die = {i: 1 / faces for i in range(1, faces + 1)}
+    regular = {0: 1.}
+    for _ in range(n):
+        regular = _convolve(regular, die)
+
+    double = {i * n: 1 / faces ** n for i in range(1, faces + 1)}
+    single = {k: v - double.get(k, 0) for k, v in regular.items()}
+
+    p_outcome = {}
+    prefix = {0: 1.}
+    for i in range(rerolls + 1):
+        last = regular if i == rerolls and not strike else single
+        for k, v in _convolve(prefix, last).items():
+            p_outcome[k] = p_outcome.get(k, 0) + v
+        prefix = _convolve(prefix, double)
+
+    p_outcome = {k: p_outcome[k] for k in sorted(p_outcome) if p_outcome[k]}
+    _DISTRIBUTION_CACHE[key] = p_outcome
+
+    return p_outcome
+
+
+# Positions watched by each color group in calculate_terrain_value. Keyed by
+# the colors of the layout and the moves of the dice
+_TERRAIN_INDEX_CACHE = {}
 
 
 class Dice:
-    def __init__(self, dice_type: str='hexa', n: int=2):
+    def __init__(
+            self, dice_type: str='hexa', n: int=2, rerolls: int=2,
+            rng: Optional[random.Random]=None):
         """
         Default to 2 dice
         """
+        self.rng = rng or random.Random()
         self.dice_count = n
-
-        if dice_type == 'quad':
-            self.face = range(1,5)
-        elif dice_type == 'hexa':
-            self.face = range(1,7)
-        elif dice_type == 'octa':
-            self.face = range(1,9)
+        self.rerolls = rerolls
+        self.face = range(1, dice_faces[dice_type] + 1)
 
         self.distribution = self.generate_distribution()
 
@@ -41,82 +117,89 @@ class Dice:
         """
         Returns the outcome of one roll
         """
-        return random.choices(self.face, k=self.dice_count)
+        return self.rng.choices(self.face, k=self.dice_count)
 
     def generate_distribution(self) -> dict:
         """
         Returns the distribution of outcome of the rolls
-        doubles: same int on both dice
-        singles: different int on both dice
-        regular: all possible rolls from a 2x 6-sided dice
-        Currently hard-coded to a double reroll, third strike format.
-
-        TODO: Allow other dice roll formats
-        All possible outcome:
+        doubles: same int on all dice
+        singles: not all dice show the same int
+        regular: all possible rolls
+        All possible outcome, shown for the default of 2 rerolls:
             1. singles
             2. doubles -> singles
-            3. doubles -> doubles -> regular
+            3. doubles -> doubles -> singles
+        Doubles on the last roll send the player to jail instead of moving
         """
-        n_outcome = max(self.face) ** self.dice_count
-
-        # Regular
-        regular = [i for i in product(self.face, self.face)]
-        regular_sum = [sum(i) for i in regular]
-
-        # Singles
-        single_sum = [sum(i) for i in regular if i[0] != i[1]]
-        p_single = {k: v/(n_outcome) for k, v in Counter(single_sum).items()}
-
-        # Doubles
-        double_sum = [sum(i) for i in regular if i[0] == i[1]]
-        _p_double = 1/n_outcome
-
-        # Doubles -> Singles
-        dblsgl_sum = [sum(i) for i in product(double_sum, single_sum)]
-        p_dblsgl = {
-            k: v * (_p_double ** 2) for k, v in Counter(dblsgl_sum).items()}
-
-        # Doubles -> Doubles -> Singles
-        dbldblsgl_sum = [sum(i) for i in product(
-            double_sum, double_sum, regular_sum)]
-        p_dbldblsgl = {
-            k: v * (_p_double ** 3) for k, v in Counter(dbldblsgl_sum).items()}
-
-        p_outcome = {}
-        for i in range(3, n_outcome + 1):
-            p_outcome[i] = \
-                p_single.get(i, 0) + \
-                p_dblsgl.get(i, 0) + \
-                p_dbldblsgl.get(i, 0)
-
-        return p_outcome
+        return dict(outcome_distribution(
+            len(self.face), self.dice_count, self.rerolls, strike=True))
 
 
 class Board:
     """
     The main board game class
     """
-    def __init__(self, lst_player: Sequence[List[str]], schema: dict):
+    # Actions that are executed as soon as the player lands on the tile
+    MANDATORY = ('pay', 'receive', 'move', 'draw')
+    # Number of tiles resolved in a turn when cards move the player along
+    MAX_LANDINGS = 3
+
+    def __init__(
+            self, lst_player: Sequence[List[str]], schema: dict,
+            agents: Optional[dict]=None, seed: Optional[int]=None,
+            log=None, turn_order: Optional[Sequence[str]]=None):
         self.dct_actions = {
             'acquire': self.player_buy,
             'add_construct': self.player_construct,
             'liquidate_title': self.player_sell,
             'pay': self.transact,
             'sell_construct': None,
-            'do_nothing': None
+            'do_nothing': None,
+            'receive': self.bank_pay,
+            'move': self.send_to_jail,
+            'draw': self.draw_card
         }
 
+        # Every source of randomness draws from its own stream spawned from
+        # the board seed, so that the dice rolls of a game do not depend on
+        # the cards drawn or the decisions of the agents
+        self.rng = random.Random(seed)
+        self._turn_rng, dice_rng, chance_rng, chest_rng = [
+            random.Random(self.rng.getrandbits(64)) for _ in range(4)]
+
         # For now players are added based on list sequence. A method will be
-        # added to determine the turn of each player later
-        self.players = {
-            p: create_player_agent('default', p) for p in lst_player}
-        lst_turn = self.assign_turns_by_shuffling()
+        # added to determine the turn of each player later. Agents are given
+        # by name or class, or as a (name, kwargs) tuple, per player token
+        agents = agents or {}
+        self.players = {}
+        for p in lst_player:
+            spec = agents.get(p, 'default')
+            name, kwargs = (spec, {}) \
+                if isinstance(spec, (str, type)) else spec
+            self.players[p] = create_player_agent(name, p, **kwargs)
+            self.players[p].board = self
+
+        # Set while search-based agents play out simulated turns
+        self.in_rollout = False
+        # Rent multiplier of the card that moved the player this turn
+        self.card_rent = None
+        # Number of turns played, and the EventLog the events of the game are
+        # recorded to, if any. Simulated turns are not recorded
+        self.nturn = 0
+        self.log = log
+
+        # Players take turns in the order given, or shuffled
+        lst_turn = list(turn_order) if turn_order \
+            else self.assign_turns_by_shuffling()
         self.player_roll = ItemCycler([self.players[p] for p in lst_turn])
 
-        self.colorgrp = {}
-        for dct in schema['board-sg'].values():
-            if dct.get('color'):
-                self.colorgrp[dct['color']] = {}
+        # The schema is compiled once per process into an immutable layout
+        # that every board built from it shares
+        self.layout = schema if isinstance(schema, BoardLayout) \
+            else compile_layout(schema)
+
+        # Tiles held by each player, as bitmasks
+        self.ownership = OwnershipIndex(self.layout, list(self.players))
 
         self.lst_tile = []
         self.player_location = {p.token: 0 for p in self.players.values()}
@@ -124,12 +207,35 @@ class Board:
 
         # Community Chest and Chance decks should be initialized only once
         # since cards are drawn from the same instance
-        self._community_chest = tile.TileCommunityChest()
-        self._chance = tile.TileChance()
+        self._community_chest = tile.TileCommunityChest(rng=chest_rng)
+        self._chance = tile.TileChance(rng=chance_rng)
 
         # Build the board
-        self.build_board(schema)
-        self.dice = Dice(dice_type='hexa', n=2)
+        self.build_board()
+        self.dice = Dice(dice_type='hexa', n=2, rng=dice_rng)
+
+        # Optional actions are numbered once per layout. legal holds the ones
+        # offered on the last landing
+        self.action_space = get_action_space(self.layout)
+        self.legal = self.action_space.nothing
+        self.index_terrain()
+
+        self._lst_rng = [
+            self.rng, self._turn_rng, self.dice.rng, self._chance.rng,
+            self._community_chest.rng]
+
+        self._lst_token = list(self.players)
+        self._player_idx = {p: i for i, p in enumerate(self._lst_token)}
+        self._purchasable = [
+            (idx, self.lst_tile[idx]) for idx in self.layout.purchasable]
+
+    @property
+    def colorgrp(self) -> dict:
+        """
+        Number of tiles of each color group held by each player
+        """
+        return {
+            color: self.ownership.counts(color) for color in self.layout.groups}
 
     @property
     def leader(self) -> list:
@@ -179,50 +285,107 @@ class Board:
         """
         Assign the turn for each player
         """
-        lst_token = self.players.keys()
-        return random.sample(lst_token, len(lst_token))
+        lst_token = list(self.players.keys())
+        return self._turn_rng.sample(lst_token, len(lst_token))
 
-    def build_board(self, schema: dict) -> None:
+    def build_board(self, layout: Optional[BoardLayout]=None) -> None:
         """
-        Constructs the full board
+        Constructs the full board from the compiled layout of the board
         """
-        for v in schema['board-sg'].values():
-            if 'chance' in v['name'].lower():
+        layout = layout or self.layout
+        for kind, v in zip(layout.kinds, layout.specs):
+            if kind == 'chance':
                 self.lst_tile += [self._chance]
-            elif 'community' in v['name'].lower():
+            elif kind == 'community':
                 self.lst_tile += [self._community_chest]
             else:
                 self.lst_tile += [TileFactory.create(v)]
 
+    def index_terrain(self) -> None:
+        """
+        Precompute the lookahead used by calculate_terrain_value. For every
+        tile, the positions whose lookahead covers the tile are recorded so
+        that cached terrain values can be invalidated selectively
+        """
+        n = len(self.lst_tile)
+        self._terrain_moves = list(self.dice.distribution.items())
+        # Terrain value per position, per player token
+        self._terrain_cache = [{} for _ in range(n)]
+
+        key = (self.layout.colors, tuple(self.dice.distribution))
+        if key in _TERRAIN_INDEX_CACHE:
+            self._terrain_watch = _TERRAIN_INDEX_CACHE[key]
+            return
+
+        watch = [set() for _ in range(n)]
+        for pos in range(n):
+            for steps, _ in self._terrain_moves:
+                watch[(pos + steps) % n].add(pos)
+
+        # Positions affected by a change to any tile in the color group
+        self._terrain_watch = {}
+        for idx, color in enumerate(self.layout.colors):
+            if color:
+                self._terrain_watch.setdefault(color, set()).update(
+                    watch[idx])
+
+        self._terrain_watch = {
+            k: tuple(sorted(v)) for k, v in self._terrain_watch.items()}
+        _TERRAIN_INDEX_CACHE[key] = self._terrain_watch
+
+    def invalidate_terrain_value(self, tile: Tile) -> None:
+        """
+        Drop the cached terrain values affected by a change to the ownership
+        or constructs of the tile. The charges of all tiles in its color group
+        depend on the number of tiles held by the owner
+        """
+        for pos in self._terrain_watch.get(getattr(tile, 'color', None), ()):
+            self._terrain_cache[pos].clear()
+
     def calculate_terrain_value(self, player: Player) -> float:
         """
         Return the series of realizable tile values for this player
         """
         p_loc = self.player_location[player.token]
+        cache = self._terrain_cache[p_loc]
+        if player.token in cache:
+            return cache[player.token]
+
+        n = len(self.lst_tile)
+        terrain_value = 0
+        for steps, pval in self._terrain_moves:
+            tile = self.lst_tile[(p_loc + steps) % n]
+            if not getattr(tile, 'color', None):
+                terrain_value += tile.get_charges() * pval
+                continue
 
-        moves = [k for k in self.dice.distribution.keys()]
-        move_range = max(moves) - min(moves)
+            # Count of tiles in a group belonging to the owner
+            ntile = self.ownership.count(tile.color, tile.owner)
+            terrain_value += tile.value_to(player.token, ntile) * pval
 
-        lst_terrain = self.lst_tile[p_loc + min(moves):]
-        if len(lst_terrain) >= move_range:
-            lst_terrain = lst_terrain[:move_range + 1]
-        else:
-            balance = move_range - len(lst_terrain)
-            lst_terrain += self.lst_tile[:balance]
+        cache[player.token] = terrain_value
 
-        pval = self.dice.distribution
-        terrain_value = [0] * len(lst_terrain)
-        # Count of tiles in a group belonging to the owner
-        for i, tile in enumerate(lst_terrain, start=min(moves)):
-            if not getattr(tile, 'color', None):
-                terrain_value[i - min(moves)] = tile.get_charges() * pval[i]
-                continue
+        return terrain_value
+
+    def complete_turn(self, tile: Tile, player: Player, action: tuple) -> None:
+        """
+        Execute the action chosen by the player and liquidate the player's
+        assets if the balance turns negative
+        """
+        self.execute_action(tile, player, action)
 
-            ntile = self.colorgrp[tile.color].get(tile.owner, 0)
-            terrain_value[i - min(moves)] = \
-                tile.value_to(player.token, ntile) * pval[i]
+        if player.balance < 0:
+            self.liquidate_player(player)
+
+    def declare_bankrupt(self, player: Player) -> None:
+        """
+        Remove the player from the game. All titles held by the player are
+        returned to the bank
+        """
+        for tile in list(chain(*player.assets.values())):
+            self.player_sell(tile, player)
 
-        return sum(terrain_value)
+        player.bankrupt = True
 
     def liquidate_player(self, player: Player) -> bool:
         """
@@ -236,10 +399,69 @@ class Board:
         # be sold based on its Agent strategy
         assets = player.cp_asset_sale(-player.balance)
 
-        for ast in assets:
-            self.player_sell(ast)
+        for ast in assets or ():
+            self.player_sell(self.lst_tile[ast], player)
+
+        if player.balance >= 0:
+            return True
+
+        self.declare_bankrupt(player)
+        return False
+
+    def log_event(
+            self, player: Player, event: str, tile: int=-1,
+            other: Optional[Player]=None, amount: int=0) -> None:
+        """
+        Record an event to the event log of the board
+        """
+        if self.log is None or self.in_rollout:
+            return
+
+        self.log.record(
+            self.nturn, self._player_idx[player.token], event, tile,
+            -1 if other is None else self._player_idx[other.token], amount)
 
-        return True if player.balance >= 0 else False
+    def get_actions(self, tile: Tile, player: Player) -> tuple:
+        """
+        Mandatory actions of the tile for the player landing on it, and the
+        LegalActions left to the player. The actions of purchasable tiles come
+        from the tables of the action space instead of Tile.get_action
+        """
+        space = self.action_space
+        if not isinstance(tile, TilePurchasable):
+            return tuple(
+                action for action in tile.get_action(player.token)
+                if action.action in self.MANDATORY), space.nothing
+
+        if tile.owner and tile.owner != player.token:
+            return (space.pay(tile.owner),), space.nothing
+
+        return (), space.legal(tile, player.token, player.balance)
+
+    def land(self, player: Player) -> tuple:
+        """
+        Resolve the tile the player has landed on. Mandatory actions (payments,
+        card draws etc.) are executed as they happen. If a card moves the
+        player, the tile moved to is resolved in turn. Returns the tile the
+        player ends up on and the optional actions left to the agent. Their
+        ids in the action space are left in Board.legal
+        """
+        self.card_rent = None
+        for _ in range(self.MAX_LANDINGS):
+            idx = self.player_location[player.token]
+            tile = self.lst_tile[idx]
+
+            mandatory, self.legal = self.get_actions(tile, player)
+            for action in mandatory:
+                self.execute_action(tile, player, action)
+
+            if player.jail or player.bankrupt or \
+                    self.player_location[player.token] == idx:
+                break
+
+        self.card_rent = None
+
+        return tile, self.legal.actions
 
     def move_to_index(self, player: Player, n: int, pastgo: bool=True):
         """
@@ -250,6 +472,8 @@ class Board:
             self.player_nround[player.token] += 1
 
         self.player_location[player.token] = n
+        if self.log is not None:
+            self.log_event(player, 'jump', n)
 
     def move_by_steps(self, player: Player, n: int):
         """
@@ -261,27 +485,116 @@ class Board:
 
         self.player_location[player.token] = \
             (self.player_location[player.token] + n) % 40
+        if self.log is not None:
+            self.log_event(
+                player, 'move', self.player_location[player.token], amount=n)
+
+    @property
+    def solvent(self) -> list:
+        """
+        Players that are still in the game
+        """
+        return [p for p in self.players.values() if not p.bankrupt]
 
-    def play_next_turn(self) -> None:
+    @property
+    def is_over(self) -> bool:
         """
-        Play out the turn of the next player in queue
+        The game ends when at most one player remains solvent
+        """
+        return len(self.solvent) <= 1
+
+    def execute_action(self, tile: Tile, player: Player, action: tuple) -> None:
+        """
+        Execute an action returned by Tile.get_action on behalf of the player
+        """
+        handler = self.dct_actions.get(action.action)
+        if handler is None:
+            return
+
+        if action.action == 'pay':
+            payee = self.players.get(action.params['payee'])
+            amt = action.params.get('amt')
+            if amt is None:
+                amt = tile.value_to(
+                    player.token,
+                    self.ownership.count(tile.color, tile.owner))
+                if self.card_rent is not None:
+                    kind, multiple = self.card_rent
+                    amt = multiple * (
+                        sum(self.dice.roll()) if kind == 'dice' else amt)
+            handler(player, payee, amt)
+            return
+
+        handler(tile, player, **action.params)
+
+    def next_player(self) -> Player:
+        """
+        Return the next player in queue that is still in the game
         """
         this_player = self.player_roll.issue_next()
+        while this_player.bankrupt:
+            this_player = self.player_roll.issue_next()
+
+        return this_player
+
+    def begin_turn(self) -> tuple:
+        """
+        Play out the next turn up to the decision of the player: roll, move
+        and resolve the tile landed on. Returns the player, the tile and the
+        optional actions to choose from, or no actions if the turn ended
+        without a decision (jail, bankruptcy)
+        """
+        this_player = self.next_player()
+        self.nturn += 1
+        # A jailed player sits out one turn, unless they hold a Get Out Of
+        # Jail Free card
+        if this_player.jail:
+            this_player.jail = False
+            if not this_player.favors['jail-free']:
+                return this_player, None, []
+            this_player.favors['jail-free'] -= 1
+
         # Roll the dice and move
         self.roll_till_move(this_player)
-        # Generate all available actions
-        this_player_tile = self.lst_tile[
-            self.player_location[this_player.token]]
-        lst_actions = this_player_tile.get_action(this_player)
-        # Add the do-nothing to the list of available actions
-        lst_actions = [(self.dct_actions[x[0]], x[1]) for x in lst_actions] + \
-            [(self.dct_actions['do_nothing'], None)]
+        if this_player.jail:
+            return this_player, None, []
+
+        this_player_tile, lst_optional = self.land(this_player)
+        if this_player.jail or this_player.bankrupt:
+            return this_player, None, []
+
+        return this_player, this_player_tile, lst_optional
+
+    def play_next_turn(self) -> Player:
+        """
+        Play out the turn of the next player in queue. Returns the player who
+        took the turn
+        """
+        this_player, this_player_tile, lst_optional = self.begin_turn()
+        if not lst_optional:
+            return this_player
+
         # Evaluate the available actions
-        next_action = this_player.cp_take_action(lst_actions)
-        action, params = next_action
-        action(**params)
+        next_action = this_player.cp_take_action(lst_optional)
+        self.complete_turn(this_player_tile, this_player, next_action)
+
+        return this_player
+
+    async def aplay_next_turn(self) -> Player:
+        """
+        Play out the turn of the next player in queue, awaiting the decision
+        of the player so that other games can run in the meantime. Assets are
+        liquidated within the turn, by the synchronous cp_asset_sale, so an
+        agent selling assets blocks the other games while it decides
+        """
+        this_player, this_player_tile, lst_optional = self.begin_turn()
+        if not lst_optional:
+            return this_player
+
+        next_action = await this_player.acp_take_action(lst_optional)
+        self.complete_turn(this_player_tile, this_player, next_action)
 
-        return
+        return this_player
 
     def player_buy(self, tile: Tile, player: Player) -> None:
         """
@@ -291,9 +604,11 @@ class Board:
         player.pay(tile.cost['title'])
         # Set player as the owner of the tile
         tile.owner = player.token
-        # Update property group dict
-        self.colorgrp[tile.color][player.token] = \
-            self.colorgrp[tile.color].get(player.token, 0) + 1
+        player.asset_acquire(tile)
+        self.ownership.add(tile.idx, player.token)
+        self.invalidate_terrain_value(tile)
+        if self.log is not None:
+            self.log_event(player, 'buy', tile.idx, amount=tile.cost['title'])
 
     def player_sell(self, tile: Tile, player: Player) -> None:
         """
@@ -303,8 +618,11 @@ class Board:
         player.receive(tile.cost['title'])
         # Set player as the owner of the tile
         tile.owner = None
-        # Update property group dict
-        self.colorgrp[tile.color][player.token] -= 1
+        player.asset_liquidate(tile)
+        self.ownership.remove(tile.idx, player.token)
+        self.invalidate_terrain_value(tile)
+        if self.log is not None:
+            self.log_event(player, 'sell', tile.idx, amount=tile.cost['title'])
 
     def player_construct(self, tile: Tile, player: Player, **kwargs) -> None:
         """
@@ -312,6 +630,78 @@ class Board:
         """
         cost = tile.add_construct(kwargs['type'], kwargs['amt'])
         player.balance -= cost
+        self.invalidate_terrain_value(tile)
+        # Builds on a tile at capacity change nothing and are not logged
+        if self.log is not None and cost:
+            self.log_event(
+                player, kwargs['type'], tile.idx, amount=kwargs['amt'])
+
+    def restore(self, snapshot: BoardSnapshot, rng: bool=True) -> None:
+        """
+        Return the board to the state captured by snapshot. Set rng to False
+        to keep the current state of the random number generators, e.g. to
+        play out different rollouts from the same snapshot
+        """
+        self.restore_columns(snapshot)
+
+        # Restored tiles are appended to the assets of their owner. Put them
+        # back in the order held, which liquidation walks
+        for token, assets in zip(self._lst_token, snapshot.assets):
+            player = self.players[token]
+            if self.asset_order(player) != assets:
+                player.assets = defaultdict(list, {
+                    color: [self.lst_tile[idx] for idx in lst_idx]
+                    for color, lst_idx in assets})
+
+        for deck, (order, top) in zip(
+                (self._chance, self._community_chest), snapshot.decks):
+            deck.deck[:] = order
+            deck.top = top
+        self.player_roll.pointer = snapshot.turn
+        self.nturn = snapshot.nturn
+        self.legal = snapshot.legal
+
+        if rng:
+            for r, state in zip(self._lst_rng, snapshot.rng):
+                r.setstate(state)
+
+    def restore_columns(self, columns) -> None:
+        """
+        Restore the tile and player columns of a BoardSnapshot or any object
+        with the same attributes. Ownership bookkeeping is updated and terrain
+        values are invalidated only for the tiles that changed
+        """
+        for idx, tile in self._purchasable:
+            owner = columns.owner[idx]
+            owner = None if owner < 0 else self._lst_token[owner]
+            changed = tile.owner != owner
+
+            if changed:
+                if tile.owner is not None:
+                    self.players[tile.owner].asset_liquidate(tile)
+                    self.ownership.remove(idx, tile.owner)
+                if owner is not None:
+                    self.players[owner].asset_acquire(tile)
+                    self.ownership.add(idx, owner)
+                tile.owner = owner
+
+            if hasattr(tile, 'house') and (tile.house, tile.hotel) != \
+                    (columns.house[idx], columns.hotel[idx]):
+                tile.house = columns.house[idx]
+                tile.hotel = columns.hotel[idx]
+                changed = True
+
+            if changed:
+                self.invalidate_terrain_value(tile)
+
+        for i, token in enumerate(self._lst_token):
+            player = self.players[token]
+            self.player_location[token] = columns.position[i]
+            self.player_nround[token] = columns.nround[i]
+            player.balance = columns.balance[i]
+            player.jail = bool(columns.jail[i])
+            player.bankrupt = bool(columns.bankrupt[i])
+            player.favors['jail-free'] = columns.jail_free[i]
 
     def roll_till_move(self, player: Player) -> None:
         """
@@ -327,22 +717,116 @@ class Board:
             steps += sum([roll_one, roll_two])
             i += 1
 
-        if i == 3:
-            player.jail = True
-            self.move_to_index(player, 10)
+        if i == 3 and roll_one == roll_two:
+            self.send_to_jail(None, player)
             return
 
         self.move_by_steps(player, steps)
 
+    @staticmethod
+    def asset_order(player: Player) -> tuple:
+        """
+        The (color, tile idx) lists of the assets of the player, in order
+        """
+        return tuple(
+            (color, tuple(tile.idx for tile in lst_tile))
+            for color, lst_tile in player.assets.items())
+
+    def snapshot(self) -> BoardSnapshot:
+        """
+        Capture the mutable state of the board: ownership, constructs, player
+        locations, rounds and balances, deck order, turn pointer and the state
+        of the random number generators
+        """
+        owner = [-1] * len(self.lst_tile)
+        house = [0] * len(self.lst_tile)
+        hotel = [0] * len(self.lst_tile)
+        for idx, tile in self._purchasable:
+            if tile.owner is not None:
+                owner[idx] = self._lst_token.index(tile.owner)
+            house[idx] = getattr(tile, 'house', 0)
+            hotel[idx] = getattr(tile, 'hotel', 0)
+
+        lst_player = [self.players[p] for p in self._lst_token]
+
+        return BoardSnapshot(
+            tuple(owner), tuple(house), tuple(hotel),
+            tuple(self.player_location[p] for p in self._lst_token),
+            tuple(self.player_nround[p] for p in self._lst_token),
+            tuple(p.balance for p in lst_player),
+            tuple(p.jail for p in lst_player),
+            tuple(p.bankrupt for p in lst_player),
+            tuple(p.favors['jail-free'] for p in lst_player),
+            tuple(self.asset_order(p) for p in lst_player),
+            tuple((tuple(deck.deck), deck.top)
+                for deck in (self._chance, self._community_chest)),
+            self.player_roll.pointer, self.nturn, self.legal,
+            tuple(r.getstate() for r in self._lst_rng))
+
+    def send_to_jail(self, tile: Tile, player: Player, **kwargs) -> None:
+        """
+        Move the player to the Jail tile without passing GO
+        """
+        player.jail = True
+        self.move_to_index(player, 10, pastgo=False)
+
+    def draw_card(self, tile: Tile, player: Player, card: dict) -> None:
+        """
+        Execute the effect of a Chance/ Community Chest card
+        """
+        if self.log is not None:
+            card_idx = next(int(k) for k, v in tile.schema.items() if v is card)
+            self.log_event(
+                player, 'draw', self.player_location[player.token],
+                amount=card_idx)
+        resolve_card(self, player, card)
+
+    def bank_pay(self, tile: Tile, player: Player, amt: int) -> None:
+        """
+        Pay the player the amount from the bank
+        """
+        player.receive(amt)
+        if self.log is not None:
+            self.log_event(player, 'receive', amount=amt)
+
     def transact(self, payer: Player, payee: Player, amt: int) -> int:
         """
-        Execute a pay and receive transaction (non-buy/sell)
+        Execute a pay and receive transaction (non-buy/sell). A payee of None
+        is the bank
         Returns 1 if complete and 0 if the payer has insufficient balance
         """
-        payee.receive(amt)
+        if payee is not None:
+            payee.receive(amt)
         payer.pay(amt)
+        if self.log is not None:
+            self.log_event(payer, 'pay', other=payee, amount=amt)
 
         if payer.balance < 0:
-            self.liquidate_player(payer)
+            return int(self.liquidate_player(payer))
+
+        return 1
+
+
+def allocate_sequence_ownership(board: Board) -> Board:
+    """
+    Hand the purchasable tiles out to the players in turn, in tile order and
+    without charging them. A fixed owned board for tests and benchmarks
+    """
+    lst_players = [x for x in board.players.values()]
+    n = len(lst_players)
+    i = 0
+
+    # Sequentially allocate ownership of tiles
+    for tile in board.lst_tile:
+        if hasattr(tile, 'owner'):
+            player = lst_players[i % n]
+            # Execute the purchase
+            tile.acquire(player.token)
+            player.asset_acquire(tile)
+            # Update the ownership index and the terrain values it affects
+            board.ownership.add(tile.idx, player.token)
+            board.invalidate_terrain_value(tile)
+
+            i += 1
 
-        return
\ No newline at end of file
+    return board
@@ -0,0 +1,126 @@
+from collections import namedtuple
+
+from player import Player
+
+
+# Effect of a Chance/ Community Chest card, compiled from its schema
+#   jail: send the player to jail
+#   jail_free: the player keeps a Get Out Of Jail Free card
+#   move_idx, move_steps, move_color: where the card moves the player to. Only
+#       one is set. move_color moves to the nearest tile of the color
+#   rent: ('dice', n) charges n times a fresh dice roll on the tile moved to,
+#       ('fee', n) charges n times the rent
+#   bank: amount received from (positive) or paid to (negative) the bank
+#   players: amount received from (positive) or paid to (negative) each of the
+#       other players
+#   repairs: (per house, per hotel) charges on the constructs of the player
+CardEffect = namedtuple('CardEffect', [
+    'jail', 'jail_free', 'move_idx', 'move_steps', 'move_color', 'rent',
+    'bank', 'players', 'repairs'])
+
+# Compiled effects keyed by id of the card schema. The card is held alongside
+# the effect so that its id cannot be reused by another object
+_EFFECT_CACHE = {}
+
+
+def compile_card(card: dict) -> CardEffect:
+    """
+    Compile the schema of a card into its effect, once per card
+    """
+    cached = _EFFECT_CACHE.get(id(card))
+    if cached is not None and cached[0] is card:
+        return cached[1]
+
+    move = card.get('move', {})
+    multiple = move.get('multiple', {})
+    rent = None
+    if 'dice' in multiple:
+        rent = ('dice', multiple['dice'])
+    elif 'fee' in multiple:
+        rent = ('fee', multiple['fee'])
+
+    bank, players, repairs = 0, 0, None
+    for sign, key in ((1, 'receive'), (-1, 'pay')):
+        flow = card.get(key, {})
+        if flow.get('bank') == 'construct':
+            repairs = (flow['multiple']['house'], flow['multiple']['hotel'])
+        else:
+            bank += sign * flow.get('bank', 0)
+        players += sign * flow.get('player', 0)
+
+    effect = CardEffect(
+        bool(card.get('jail')), bool(card.get('jail-free')),
+        None if card.get('jail') else move.get('idx'), move.get('steps'),
+        move.get('color'), rent, bank, players, repairs)
+    _EFFECT_CACHE[id(card)] = (card, effect)
+
+    return effect
+
+
+def card_destination(layout, effect: CardEffect, idx: int) -> int:
+    """
+    Index of the tile the card moves a player on tile idx to
+    """
+    if effect.move_idx is not None:
+        return effect.move_idx
+    elif effect.move_steps is not None:
+        return (idx + effect.move_steps) % len(layout.specs)
+    elif effect.move_color is not None:
+        return layout.nearest[effect.move_color][idx]
+
+    return idx
+
+
+def resolve_card(board, player: Player, card: dict) -> None:
+    """
+    Execute the effect of the card drawn by the player. Moves leave the rent
+    multiplier of the card on the board for the tile the player lands on
+    """
+    effect = compile_card(card)
+
+    if effect.jail_free:
+        player.favors['jail-free'] += 1
+
+    if effect.bank > 0:
+        board.bank_pay(None, player, effect.bank)
+    elif effect.bank < 0:
+        board.transact(player, None, -effect.bank)
+
+    if effect.players:
+        for other in board.solvent:
+            if other is player:
+                continue
+            if effect.players > 0:
+                board.transact(other, player, effect.players)
+            else:
+                board.transact(player, other, -effect.players)
+                # A bankrupt player pays no one else
+                if player.bankrupt:
+                    break
+
+    if effect.repairs:
+        per_house, per_hotel = effect.repairs
+        amt = sum(
+            getattr(t, 'house', 0) * per_house +
+            getattr(t, 'hotel', 0) * per_hotel
+            for tiles in player.assets.values() for t in tiles)
+        if amt:
+            board.transact(player, None, amt)
+
+    if player.bankrupt:
+        return
+
+    if effect.jail:
+        board.send_to_jail(None, player)
+        return
+
+    idx = board.player_location[player.token]
+    target = card_destination(board.layout, effect, idx)
+    if target == idx:
+        return
+
+    if effect.move_steps is not None:
+        board.move_by_steps(player, effect.move_steps)
+    else:
+        board.move_to_index(player, target)
+    board.card_rent = effect.rent
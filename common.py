@@ -4,4 +4,7 @@ import os
 ROOTDIR = os.path.dirname(__file__)
 DATADIR = os.path.join(ROOTDIR, 'data')
 
-capacity = {'house': 3, 'hotel': 1}
\ No newline at end of file
+capacity = {'house': 3, 'hotel': 1}
+
+# Number of faces per dice type
+dice_faces = {'quad': 4, 'hexa': 6, 'octa': 8}
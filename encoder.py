@@ -0,0 +1,184 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+from board import outcome_distribution
+from common import dice_faces
+from layout import BoardLayout
+
+
+class BoardEncoder:
+    """
+    Encodes a Board into a fixed-length float32 vector. Players are ordered
+    from the point of view of the given player, who comes first, followed by
+    the others in the order of Board.players. Sections, in order:
+        owner: one-hot owner of each purchasable tile, bank first
+        house, hotel: constructs on each purchasable tile, houses over 4
+        group: share of each color group owned by each player
+        balance: balance of each player over the starting balance
+        position: one-hot tile of each player
+        jail: jail flag of each player
+        dice: probability of each tile being the next one landed on by each
+            player, before any card or Go To Jail
+    Index arrays are computed once per layout, so encoding only fills the
+    output in place
+    """
+    def __init__(
+            self, layout: BoardLayout, n_players: int=4,
+            dice_type: str='hexa', n: int=2) -> None:
+        self.layout = layout
+        self.n_players = n_players
+        self.n_tiles = len(layout.specs)
+
+        self.purchasable = np.array(layout.purchasable, dtype=np.intp)
+        self.groups = list(layout.groups.items())
+
+        n_owned = len(self.purchasable)
+        sizes = {
+            'owner': n_owned * (n_players + 1),
+            'house': n_owned,
+            'hotel': n_owned,
+            'group': n_players * len(self.groups),
+            'balance': n_players,
+            'position': n_players * self.n_tiles,
+            'jail': n_players,
+            'dice': n_players * self.n_tiles}
+        self.sections = {}
+        start = 0
+        for k, size in sizes.items():
+            self.sections[k] = slice(start, start + size)
+            start += size
+        self.size = start
+
+        # Rank of each player, by position in Board.players, from the point
+        # of view of each player
+        seats = np.arange(n_players)
+        self._ranks = (seats[None, :] - seats[:, None]) % n_players
+
+        # Position of the one-hot owner flag of each tile, by owner rank
+        self._owner_base = self.sections['owner'].start + \
+            np.arange(n_owned) * (n_players + 1)
+        self._bits = np.array(
+            [1 << idx for idx in layout.purchasable], dtype=np.int64)
+        # (output position, tile idx) of the construct counts of properties
+        self._house = [
+            (self.sections['house'].start + k, idx)
+            for k, idx in enumerate(layout.purchasable)
+            if layout.kinds[idx] == 'property']
+        self._hotel = [
+            (self.sections['hotel'].start + k, idx)
+            for k, idx in enumerate(layout.purchasable)
+            if layout.kinds[idx] == 'property']
+        self._group_masks = [
+            (j, sum(1 << idx for idx in members), len(members))
+            for j, (_, members) in enumerate(self.groups)]
+
+        # Start of the position and dice rows of each rank
+        self._position_base = self.sections['position'].start + \
+            seats * self.n_tiles
+        self._dice_base = self.sections['dice'].start + \
+            seats * self.n_tiles
+
+        distribution = outcome_distribution(dice_faces[dice_type], n)
+        self._steps = np.array(list(distribution), dtype=np.intp)
+        self._probs = np.broadcast_to(
+            np.array(list(distribution.values()), dtype=np.float32),
+            (n_players, len(distribution)))
+
+        # Scratch arrays reused across calls
+        self._masked = np.empty(n_owned, dtype=np.int64)
+        self._held = np.empty(n_owned, dtype=bool)
+        self._owner_rank = np.empty(n_owned, dtype=np.intp)
+        self._location = np.empty(n_players, dtype=np.intp)
+        self._index = np.empty(n_players, dtype=np.intp)
+        self._landing = np.empty(
+            (n_players, len(distribution)), dtype=np.intp)
+
+    def __call__(self, board, player=None, tile=None,
+            out: Optional[np.ndarray]=None) -> np.ndarray:
+        """
+        Encode the board from the point of view of the player, as a feature
+        function for scheduler.play_games_batched
+        """
+        return self.encode(board, player, out)
+
+    def encode(self, board, player=None,
+            out: Optional[np.ndarray]=None) -> np.ndarray:
+        """
+        Encode the board into out, a float32 vector of length size
+        """
+        if out is None:
+            out = np.empty(self.size, dtype=np.float32)
+        out.fill(0.)
+
+        first = 0
+        if player is not None:
+            for i, token in enumerate(board.players):
+                if token == player.token:
+                    first = i
+                    break
+        rank = self._ranks[first]
+
+        # Owner rank of each tile, 0 for the bank
+        owner_rank, held = self._owner_rank, self._held
+        owner_rank.fill(0)
+        group = out[self.sections['group']]
+        n_groups = len(self.groups)
+        for i, mask in enumerate(board.ownership.masks.values()):
+            if not mask:
+                continue
+            np.bitwise_and(self._bits, mask, out=self._masked)
+            np.not_equal(self._masked, 0, out=held)
+            np.copyto(owner_rank, rank[i] + 1, where=held)
+
+            row = rank[i] * n_groups
+            for j, group_mask, size in self._group_masks:
+                group[row + j] = (mask & group_mask).bit_count() / size
+        np.add(self._owner_base, owner_rank, out=owner_rank)
+        out[owner_rank] = 1.
+
+        tiles = board.lst_tile
+        for k, idx in self._house:
+            out[k] = tiles[idx].house / 4
+        for k, idx in self._hotel:
+            out[k] = tiles[idx].hotel
+
+        balance = self.sections['balance'].start
+        jail = self.sections['jail'].start
+        location = self._location
+        for i, p in enumerate(board.players.values()):
+            out[balance + rank[i]] = p.balance / 1500
+            out[jail + rank[i]] = p.jail
+            location[i] = board.player_location[p.token]
+
+        index = self._index
+        np.take(self._position_base, rank, out=index)
+        np.add(index, location, out=index)
+        out[index] = 1.
+
+        # Outcomes past a full lap wrap onto tiles reached by shorter rolls,
+        # so the probabilities are summed rather than assigned
+        landing = self._landing
+        np.add(location[:, None], self._steps, out=landing)
+        np.remainder(landing, self.n_tiles, out=landing)
+        np.take(self._dice_base, rank, out=index)
+        np.add(landing, index[:, None], out=landing)
+        np.add.at(out, landing, self._probs)
+
+        return out
+
+    def encode_batch(
+            self, boards: Sequence, players: Optional[Sequence]=None,
+            out: Optional[np.ndarray]=None) -> np.ndarray:
+        """
+        Encode the boards into the rows of out, a (len(boards), size) float32
+        array
+        """
+        if out is None:
+            out = np.empty((len(boards), self.size), dtype=np.float32)
+
+        players = players or [None] * len(boards)
+        for k, (board, player) in enumerate(zip(boards, players)):
+            self.encode(board, player, out[k])
+
+        return out
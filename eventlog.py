@@ -0,0 +1,113 @@
+import os
+
+from typing import Optional
+
+import numpy as np
+
+
+# Event codes. The meaning of the tile, other and amount fields per event:
+#   move: tile moved to, amount is the number of steps
+#   jump: tile moved to by index, e.g. a card or Go To Jail
+#   buy, sell: tile traded, amount is the title cost
+#   house, hotel: tile built on, amount is the number of constructs added
+#   pay: other is the payee (-1 for the bank), amount paid
+#   receive: amount received from the bank
+#   draw: tile of the deck, amount is the card idx in the deck schema
+EVENTS = (
+    'move', 'jump', 'buy', 'sell', 'house', 'hotel', 'pay', 'receive', 'draw')
+EVENT_CODE = {name: code for code, name in enumerate(EVENTS)}
+
+# Fixed-width record of a single event. Players are indexed by the order of
+# Board.players and -1 stands for the bank or no tile
+RECORD_DTYPE = np.dtype([
+    ('game', '<u4'), ('turn', '<u4'), ('player', 'i1'), ('event', 'u1'),
+    ('tile', 'i1'), ('other', 'i1'), ('amount', '<i4')])
+
+
+class EventLog:
+    """
+    Append-only log of the events of one or more games. Records are buffered
+    as tuples and written out as a RECORD_DTYPE array every capacity records,
+    to the file at path if given, else kept in memory. Files are raw record
+    arrays that load_events maps back without parsing
+    """
+    def __init__(self, path: Optional[str]=None, capacity: int=65536):
+        self.path = path
+        self.capacity = capacity
+        # Game id stamped on the records, set by the caller between games
+        self.game = 0
+
+        self._buffer = []
+        self._chunks = []
+        self._file = open(path, 'ab') if path else None
+
+    def __len__(self) -> int:
+        if self._file is not None:
+            return self._file.tell() // RECORD_DTYPE.itemsize + \
+                len(self._buffer)
+
+        return sum(len(c) for c in self._chunks) + len(self._buffer)
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def record(
+            self, turn: int, player: int, event: str, tile: int=-1,
+            other: int=-1, amount: int=0) -> None:
+        """
+        Append an event of the current game
+        """
+        self._buffer.append(
+            (self.game, turn, player, EVENT_CODE[event], tile, other, amount))
+        if len(self._buffer) >= self.capacity:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write out the buffered records
+        """
+        if not self._buffer:
+            return
+
+        chunk = np.array(self._buffer, dtype=RECORD_DTYPE)
+        self._buffer.clear()
+        if self._file is not None:
+            self._file.write(chunk.tobytes())
+            self._file.flush()
+        else:
+            self._chunks.append(chunk)
+
+    def close(self) -> None:
+        """
+        Flush the buffer and close the file, if any
+        """
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def to_array(self) -> np.ndarray:
+        """
+        All records logged so far
+        """
+        self.flush()
+        if self.path:
+            return load_events(self.path)
+        elif not self._chunks:
+            return np.empty(0, dtype=RECORD_DTYPE)
+
+        self._chunks = [np.concatenate(self._chunks)]
+        return self._chunks[0]
+
+
+def load_events(path: str) -> np.ndarray:
+    """
+    Map an event log file into a read-only record array
+    """
+    if not os.path.getsize(path):
+        return np.empty(0, dtype=RECORD_DTYPE)
+
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r')
@@ -0,0 +1,186 @@
+import json
+import time
+
+from collections import Counter
+from typing import Optional
+
+
+class Profiler:
+    """
+    Records the wall-clock time and call count of each phase of the turns
+    played on the boards it is attached to:
+        turn: from Board.begin_turn to Board.complete_turn, or to the end of
+            begin_turn for turns without a decision
+        begin: Board.begin_turn, rolling and landing
+        complete: Board.complete_turn, the chosen action and any liquidation
+        roll: Board.roll_till_move
+        actions: Board.get_actions, i.e. the action tables
+        decide: cp_take_action of the players
+        execute: Board.execute_action
+        liquidate: Board.liquidate_player
+    Times are inclusive of the phases nested within, e.g. an execute that
+    liquidates. Turns are timed the same whichever drives them, be it
+    play_next_turn, aplay_next_turn, the server or the batched scheduler.
+    When the decision is awaited, remote or batched, the turn includes the
+    wait, during which other games may run, and the decision itself is not
+    timed as decide. Phases are timed by wrapping the methods of the
+    attached board and players, so detached boards run the plain methods at
+    no cost. Turns simulated by search agents are not recorded. With trace
+    set, each call is also kept as an event, up to max_events, for export as
+    a Chrome trace
+    """
+    BOARD_PHASES = {
+        'begin': 'begin_turn',
+        'complete': 'complete_turn',
+        'roll': 'roll_till_move',
+        'actions': 'get_actions',
+        'execute': 'execute_action',
+        'liquidate': 'liquidate_player'
+    }
+    PLAYER_PHASES = {'decide': 'cp_take_action'}
+
+    def __init__(self, trace: bool=False, max_events: int=1000000) -> None:
+        self.totals = Counter()
+        self.counts = Counter()
+        self.max_events = max_events
+        # (phase, start, duration, board id) of each call when tracing
+        self.events = [] if trace else None
+
+        self._attached = []
+        self._origin = time.perf_counter()
+
+    def __enter__(self) -> "Profiler":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for board in list(self._attached):
+            self.detach(board)
+
+    def _record(self, phase: str, start: float, elapsed: float,
+            tid: int) -> None:
+        self.totals[phase] += elapsed
+        self.counts[phase] += 1
+        events = self.events
+        if events is not None and len(events) < self.max_events:
+            events.append((phase, start, elapsed, tid))
+
+    def _wrap(self, board, phase: str, func):
+        record = self._record
+        clock = time.perf_counter
+        tid = len(self._attached)
+
+        def timed(*args, **kwargs):
+            if board.in_rollout:
+                return func(*args, **kwargs)
+
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(phase, start, clock() - start, tid)
+
+        return timed
+
+    def _wrap_turn(self, board) -> None:
+        """
+        Time each turn from the start of begin_turn to the end of the
+        complete_turn that follows it
+        """
+        record = self._record
+        clock = time.perf_counter
+        tid = len(self._attached)
+        begin, complete = board.begin_turn, board.complete_turn
+        # Start of the turn waiting on its decision
+        pending = [None]
+
+        def begin_turn():
+            if board.in_rollout:
+                return begin()
+
+            start = clock()
+            result = begin()
+            if result[2]:
+                pending[0] = start
+            else:
+                record('turn', start, clock() - start, tid)
+
+            return result
+
+        def complete_turn(*args, **kwargs):
+            if board.in_rollout:
+                return complete(*args, **kwargs)
+
+            try:
+                return complete(*args, **kwargs)
+            finally:
+                start, pending[0] = pending[0], None
+                if start is not None:
+                    record('turn', start, clock() - start, tid)
+
+        board.begin_turn, board.complete_turn = begin_turn, complete_turn
+
+    def attach(self, board) -> "Profiler":
+        """
+        Start recording the turns played on the board
+        """
+        for phase, name in self.BOARD_PHASES.items():
+            setattr(board, name, self._wrap(board, phase, getattr(board, name)))
+        self._wrap_turn(board)
+        for player in board.players.values():
+            for phase, name in self.PLAYER_PHASES.items():
+                setattr(player, name,
+                    self._wrap(board, phase, getattr(player, name)))
+        self._attached.append(board)
+
+        return self
+
+    def detach(self, board) -> None:
+        """
+        Stop recording, restoring the plain methods of the board
+        """
+        for name in self.BOARD_PHASES.values():
+            vars(board).pop(name, None)
+        for player in board.players.values():
+            for name in self.PLAYER_PHASES.values():
+                vars(player).pop(name, None)
+        self._attached.remove(board)
+
+    def summary(self) -> dict:
+        """
+        Calls, total and mean seconds per phase, and the share of the turn
+        time spent on each
+        """
+        turn = self.totals['turn']
+        return {
+            phase: {
+                'calls': self.counts[phase],
+                'total': self.totals[phase],
+                'mean': self.totals[phase] / self.counts[phase],
+                'share': self.totals[phase] / turn if turn else 0.
+            }
+            for phase in self.counts}
+
+    def chrome_trace(self) -> dict:
+        """
+        Recorded events in the Chrome trace event format, viewable in
+        chrome://tracing or Perfetto. One thread per board
+        """
+        events = [{
+            'name': phase, 'cat': 'board', 'ph': 'X', 'pid': 0, 'tid': tid,
+            'ts': (start - self._origin) * 1e6, 'dur': elapsed * 1e6}
+            for phase, start, elapsed, tid in self.events or ()]
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def profile(board, trace: bool=False,
+        profiler: Optional[Profiler]=None) -> Profiler:
+    """
+    Attach a profiler to the board. Use as a context manager to detach it
+    once done
+    """
+    return (profiler or Profiler(trace)).attach(board)
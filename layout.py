@@ -0,0 +1,143 @@
+import json
+
+from collections import namedtuple
+
+from tile import rent_table
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict. Unlike MappingProxyType it can be pickled, so layouts and
+    the boards built from them can be sent to process pools
+    """
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"'{type(self).__name__}' object is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self) -> tuple:
+        return type(self), (dict(self),)
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self.items()))
+
+
+def freeze(value):
+    """
+    Read-only copy of a schema value: dicts become FrozenDicts and lists
+    tuples, all the way down
+    """
+    if isinstance(value, dict):
+        return FrozenDict({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+
+    return value
+
+
+# Immutable, precomputed description of a board schema. All fields are indexed
+# by tile idx unless stated otherwise
+#   specs: read-only tile schema, with the rent table added for purchasable
+#       tiles
+#   kinds: tile type, 'chance' and 'community' for the card decks
+#   names: tile names
+#   colors: color group of the tile, None for tiles without one
+#   rents: rent table of the tile indexed by the number of tiles owned
+#   groups: color -> tile idx in the color group
+#   nearest: color -> idx of the nearest tile of that color strictly ahead
+#   purchasable: idx of the property and infra tiles
+BoardLayout = namedtuple('BoardLayout', [
+    'specs', 'kinds', 'names', 'colors', 'rents', 'groups', 'nearest',
+    'purchasable'])
+
+# Compiled layouts keyed by the content of the schema, so that copies of a
+# schema, e.g. unpickled in each task of a process pool, share one layout
+_LAYOUT_CACHE = {}
+_LAYOUT_CACHE_SIZE = 128
+# Schema objects seen last, with their layout, to skip serializing a schema
+# passed again. The schema is held alongside the layout so that its id cannot
+# be reused by another object
+_LAST_SCHEMA = {}
+# Compiled layouts keyed by schema file path
+_FILE_CACHE = {}
+
+
+def _tile_kind(spec: dict) -> str:
+    """
+    Type of the tile. Card deck tiles are told apart by their name
+    """
+    name = spec['name'].lower()
+    if 'chance' in name:
+        return 'chance'
+    elif 'community' in name:
+        return 'community'
+
+    return spec['type']
+
+
+def compile_layout(schema: dict) -> BoardLayout:
+    """
+    Compile a board schema into a BoardLayout, once per schema content
+    """
+    cached = _LAST_SCHEMA.get(id(schema))
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+
+    key = json.dumps(schema, sort_keys=True)
+    layout = _LAYOUT_CACHE.get(key)
+    if layout is None:
+        layout = _compile(schema)
+        if len(_LAYOUT_CACHE) >= _LAYOUT_CACHE_SIZE:
+            _LAYOUT_CACHE.clear()
+        _LAYOUT_CACHE[key] = layout
+
+    if len(_LAST_SCHEMA) >= _LAYOUT_CACHE_SIZE:
+        _LAST_SCHEMA.clear()
+    _LAST_SCHEMA[id(schema)] = (schema, layout)
+
+    return layout
+
+
+def _compile(schema: dict) -> BoardLayout:
+    specs, kinds, colors, rents = [], [], [], []
+    for v in schema['board-sg'].values():
+        kind = _tile_kind(v)
+        rent = rent_table(v['schedule']['title']) if 'schedule' in v else ()
+        v = freeze(dict(v, rent=rent) if rent else v)
+
+        specs.append(v)
+        kinds.append(kind)
+        colors.append(v.get('color'))
+        rents.append(rent)
+
+    n = len(specs)
+    groups = {}
+    for idx, color in enumerate(colors):
+        if color:
+            groups[color] = groups.get(color, ()) + (idx,)
+
+    nearest = {}
+    for color, members in groups.items():
+        nearest[color] = tuple(
+            min(members, key=lambda m: (m - idx - 1) % n) for idx in range(n))
+
+    layout = BoardLayout(
+        tuple(specs), tuple(kinds), tuple(v['name'] for v in specs),
+        tuple(colors), tuple(rents), FrozenDict(groups), FrozenDict(nearest),
+        tuple(i for i, k in enumerate(kinds) if k in ('property', 'infra')))
+
+    return layout
+
+
+def load_layout(fpath: str) -> BoardLayout:
+    """
+    Load and compile a board schema from json file, once per process
+    """
+    if fpath not in _FILE_CACHE:
+        with open(fpath, 'r') as f:
+            _FILE_CACHE[fpath] = compile_layout(json.load(f))
+
+    return _FILE_CACHE[fpath]
@@ -0,0 +1,130 @@
+import json
+import os
+
+from collections import Counter
+
+import numpy as np
+
+from board import Board, outcome_distribution
+from cards import card_destination, compile_card
+from common import DATADIR, dice_faces
+from layout import BoardLayout, compile_layout
+from tile import load_card_schema
+
+
+JAIL_IDX = 10
+# Index of the extra state for a player serving time in jail
+IN_JAIL = 40
+N_STATES = 41
+
+_CACHE = {}
+
+
+def _load_deck(fname: str) -> list:
+    """
+    Load the cards of a Chance/ Community Chest deck
+    """
+    return list(load_card_schema(os.path.join(DATADIR, fname)).values())
+
+
+def turn_distribution(dice_type: str='hexa', n: int=2) -> tuple:
+    """
+    Returns the distribution of the total steps moved in one turn and the
+    probability of being sent to jail on the third double in a row
+    """
+    p_steps = outcome_distribution(dice_faces[dice_type], n, strike=True)
+
+    return p_steps, 1 - sum(p_steps.values())
+
+
+def _resolve_card(card: dict, idx: int, layout: BoardLayout) -> int:
+    """
+    Returns the state the player ends up in after drawing the card on tile idx
+    """
+    effect = compile_card(card)
+    if effect.jail:
+        return IN_JAIL
+
+    return card_destination(layout, effect, idx)
+
+
+def _land(idx: int, layout: BoardLayout, decks: dict, depth: int=1) -> Counter:
+    """
+    Returns the distribution of the state a player ends the turn in after
+    landing on tile idx. A card moving the player resolves the tile moved to
+    in turn, up to Board.MAX_LANDINGS tiles as in Board.land
+    """
+    if layout.names[idx] == 'Go To Jail':
+        return Counter({IN_JAIL: 1.})
+
+    deck = decks.get(layout.kinds[idx])
+    if not deck:
+        return Counter({idx: 1.})
+
+    outcome = Counter()
+    for card in deck:
+        state = _resolve_card(card, idx, layout)
+        if state == IN_JAIL or state == idx or depth >= Board.MAX_LANDINGS:
+            outcome[state] += 1 / len(deck)
+            continue
+
+        for k, v in _land(state, layout, decks, depth + 1).items():
+            outcome[k] += v / len(deck)
+
+    return outcome
+
+
+def transition_matrix(
+        schema: dict, dice_type: str='hexa', n: int=2) -> np.ndarray:
+    """
+    Build the turn-by-turn transition matrix over the 40 tiles plus the
+    in-jail state. A player in jail sits out one turn and is then released
+    onto the Jail tile. Get Out Of Jail Free cards are not modelled: every
+    stay in jail lasts the full turn
+    """
+    layout = compile_layout(schema)
+    p_steps, p_jail = turn_distribution(dice_type, n)
+    decks = {
+        'chance': _load_deck('schema_chance.json'),
+        'community': _load_deck('schema_chest.json')
+    }
+
+    # Where a player ends the turn after landing on each tile
+    landing = [_land(idx, layout, decks) for idx in range(40)]
+
+    matrix = np.zeros((N_STATES, N_STATES))
+    for idx in range(40):
+        matrix[idx, IN_JAIL] += p_jail
+        for steps, p in p_steps.items():
+            for state, q in landing[(idx + steps) % 40].items():
+                matrix[idx, state] += p * q
+
+    matrix[IN_JAIL, JAIL_IDX] = 1.
+
+    return matrix
+
+
+def stationary_distribution(
+        schema: dict, dice_type: str='hexa', n: int=2) -> tuple:
+    """
+    Solve for the long-run probability of ending a turn on each tile. Time
+    served in jail is counted on the Jail tile. Results are cached per schema
+    and dice
+    """
+    key = (json.dumps(schema, sort_keys=True), dice_type, n)
+    if key in _CACHE:
+        return _CACHE[key]
+
+    matrix = transition_matrix(schema, dice_type, n)
+
+    # pi (P - I) = 0 with the probabilities summing up to 1
+    lhs = matrix.T - np.eye(N_STATES)
+    lhs[-1] = 1.
+    rhs = np.zeros(N_STATES)
+    rhs[-1] = 1.
+    pi = np.clip(np.linalg.solve(lhs, rhs), 0., None)
+
+    pi[JAIL_IDX] += pi[IN_JAIL]
+    _CACHE[key] = tuple(pi[:40].tolist())
+
+    return _CACHE[key]
@@ -0,0 +1,82 @@
+from typing import Optional, Sequence
+
+from layout import BoardLayout
+
+
+class OwnershipIndex:
+    """
+    Tiles owned by each player as a bitmask over tile idx, with a mask per
+    color group. The number of tiles of a group held by a player, and whether
+    the player holds the whole group, are a single AND and popcount
+    """
+    __slots__ = ('masks', 'group_masks', 'tile_masks', 'kinds')
+
+    def __init__(self, layout: BoardLayout, lst_token: Sequence[str]):
+        self.masks = {token: 0 for token in lst_token}
+        self.group_masks = {
+            color: sum(1 << idx for idx in members)
+            for color, members in layout.groups.items()}
+        # Mask of the color group of each tile, 0 for tiles without one
+        self.tile_masks = tuple(
+            self.group_masks.get(color, 0) for color in layout.colors)
+        self.kinds = layout.kinds
+
+    def add(self, idx: int, token: str) -> None:
+        """
+        Record the player as the owner of the tile
+        """
+        self.masks[token] |= 1 << idx
+
+    def remove(self, idx: int, token: str) -> None:
+        """
+        Record the tile as no longer owned by the player
+        """
+        self.masks[token] &= ~(1 << idx)
+
+    def owner(self, idx: int) -> Optional[str]:
+        """
+        Token of the owner of the tile, None for the bank
+        """
+        bit = 1 << idx
+        for token, mask in self.masks.items():
+            if mask & bit:
+                return token
+
+        return None
+
+    def count(self, color: str, token: Optional[str]) -> int:
+        """
+        Number of tiles of the color group owned by the player
+        """
+        return (self.masks.get(token, 0) & self.group_masks[color]).bit_count()
+
+    def count_at(self, idx: int, token: Optional[str]) -> int:
+        """
+        Number of tiles owned by the player in the color group of the tile
+        """
+        return (self.masks.get(token, 0) & self.tile_masks[idx]).bit_count()
+
+    def owns_group(self, token: Optional[str], color: str) -> bool:
+        """
+        Whether the player holds every tile of the color group
+        """
+        group = self.group_masks[color]
+        return self.masks.get(token, 0) & group == group
+
+    def can_build(self, token: str, idx: int) -> bool:
+        """
+        Whether the player may build on the tile: a property whose whole color
+        group the player holds
+        """
+        group = self.tile_masks[idx]
+        return self.kinds[idx] == 'property' and \
+            self.masks.get(token, 0) & group == group
+
+    def counts(self, color: str) -> dict:
+        """
+        Number of tiles of the color group owned by each player
+        """
+        group = self.group_masks[color]
+        return {
+            token: (mask & group).bit_count()
+            for token, mask in self.masks.items()}
@@ -17,6 +17,8 @@ class Player:
         self.favors = defaultdict(int)
         # Jail status
         self.jail = False
+        # Bankruptcy status
+        self.bankrupt = False
 
     def pay(self, amount: int) -> None:
         """
@@ -40,4 +42,4 @@ class Player:
         """
         Remove a property from the assets of this player
         """
-        self.assets[asset.color].pop(asset)
\ No newline at end of file
+        self.assets[asset.color].remove(asset)
\ No newline at end of file
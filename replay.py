@@ -0,0 +1,168 @@
+import bisect
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from board import Board
+from eventlog import EVENT_CODE, EVENTS
+
+
+class ReplayDivergence(ValueError):
+    """
+    The replayed game differs from the logged one, e.g. the log was recorded
+    with another seed or player order
+    """
+
+
+class _TurnEvents:
+    """
+    Stands in for the EventLog of the replayed board, keeping the events of
+    the turn being played as (player, event, tile, other, amount)
+    """
+    def __init__(self) -> None:
+        self.game = 0
+        self.events = []
+
+    def record(
+            self, turn: int, player: int, event: str, tile: int=-1,
+            other: int=-1, amount: int=0) -> None:
+        self.events.append((player, EVENT_CODE[event], tile, other, amount))
+
+
+# Events that record a decision of the player, rather than an outcome of the
+# dice or the cards
+DECISIONS = ('buy', 'sell', 'house', 'hotel')
+
+
+def extract_decisions(records: np.ndarray, n_players: int) -> list:
+    """
+    Decisions of each player in the records of a game, as a dict of turn to
+    the (event, tile idx, amount) of the player in that turn
+    """
+    codes = [EVENTS.index(e) for e in DECISIONS]
+    records = records[np.isin(records['event'], codes)]
+
+    decisions = [{} for _ in range(n_players)]
+    for turn, player, event, idx, amount in zip(
+            records['turn'].tolist(), records['player'].tolist(),
+            records['event'].tolist(), records['tile'].tolist(),
+            records['amount'].tolist()):
+        decisions[player].setdefault(turn, []).append(
+            (EVENTS[event], idx, amount))
+
+    return decisions
+
+
+def describe(event: Optional[tuple]) -> str:
+    """
+    Readable (player, event, tile, other, amount) event
+    """
+    if event is None:
+        return 'nothing'
+
+    player, code, tile, other, amount = event
+    return f'{EVENTS[code]}(player={player}, tile={tile}, other={other}, ' \
+        f'amount={amount})'
+
+
+class GameReplay:
+    """
+    Replays a logged game on a Board to any turn. The dice and the cards are
+    reproduced from the seed of the game and the decisions of the players are
+    taken from the log, so no agent logic is run. Every turn played out is
+    checked against the events logged for it, and ReplayDivergence is raised
+    on the first difference, e.g. when the game id of the log is not the seed
+    the game was played with or the game was played unseeded. A
+    keyframe snapshot is kept every keyframe_interval turns, so seeking only
+    plays out the turns since the nearest keyframe
+    """
+    def __init__(
+            self, lst_token: Sequence[str], schema: dict, records: np.ndarray,
+            seed: Optional[int]=None, keyframe_interval: int=50) -> None:
+        if seed is None:
+            seed = int(records['game'][0])
+        self.records = records[records['game'] == seed]
+        self.keyframe_interval = keyframe_interval
+
+        decisions = extract_decisions(self.records, len(lst_token))
+        self._played = _TurnEvents()
+        self.board = Board(
+            lst_token, schema=schema, seed=seed, log=self._played, agents={
+                token: ('replay', {'decisions': decisions[i]})
+                for i, token in enumerate(lst_token)})
+
+        # Turns with a keyframe, in order, and their snapshots
+        self._keyframe_turns = [0]
+        self.keyframes = {0: self.board.snapshot()}
+
+    @property
+    def turn(self) -> int:
+        """
+        Number of turns played out on the board
+        """
+        return self.board.nturn
+
+    @property
+    def last_turn(self) -> int:
+        """
+        Last turn in the log
+        """
+        return int(self.records['turn'][-1]) if len(self.records) else 0
+
+    def events(self, turn: int) -> np.ndarray:
+        """
+        Logged events of a turn
+        """
+        lo, hi = np.searchsorted(self.records['turn'], [turn, turn + 1])
+
+        return self.records[lo:hi]
+
+    def check(self, turn: int, played: list) -> None:
+        """
+        Raise ReplayDivergence unless the events played out in the turn are
+        the ones logged for it
+        """
+        logged = self.events(turn)
+        logged = list(zip(
+            logged['player'].tolist(), logged['event'].tolist(),
+            logged['tile'].tolist(), logged['other'].tolist(),
+            logged['amount'].tolist()))
+        if played == logged:
+            return
+
+        for k, (one, two) in enumerate(zip(played + [None], logged + [None])):
+            if one != two:
+                break
+        raise ReplayDivergence(
+            f'Turn {turn} diverges from the log at event {k}: '
+            f'replayed {describe(one)}, logged {describe(two)}')
+
+    def seek(self, turn: int) -> Board:
+        """
+        Bring the board to its state at the end of the turn, restoring the
+        nearest keyframe first unless the board is already on its way there
+        """
+        i = bisect.bisect_right(self._keyframe_turns, turn) - 1
+        keyframe = self._keyframe_turns[i]
+        if not keyframe <= self.board.nturn <= turn:
+            self.board.restore(self.keyframes[keyframe])
+            for player in self.board.players.values():
+                player.rewind()
+
+        while self.board.nturn < turn and not self.board.is_over:
+            self._played.events.clear()
+            self.board.play_next_turn()
+            self.check(self.board.nturn, self._played.events)
+
+            if not self.board.nturn % self.keyframe_interval and \
+                    self.board.nturn not in self.keyframes:
+                bisect.insort(self._keyframe_turns, self.board.nturn)
+                self.keyframes[self.board.nturn] = self.board.snapshot()
+
+        if self.board.nturn < min(turn, self.last_turn):
+            raise ReplayDivergence(
+                f'Replayed game ended at turn {self.board.nturn}, logged up '
+                f'to turn {self.last_turn}')
+
+        return self.board
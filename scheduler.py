@@ -0,0 +1,177 @@
+import asyncio
+import os
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Sequence
+
+import numpy as np
+
+from agent.batch_agent import decision_features
+from agent.metaclass import AbstractBatchAgent
+from board import Board
+from simulation import GameResult, SimulationSummary, game_result
+
+
+def with_executor(agents: Optional[dict], lst_token: Sequence[str],
+        executor) -> dict:
+    """
+    Agent specs of Board with the executor added to the options of each agent
+    """
+    agents = agents or {}
+    specs = {}
+    for token in lst_token:
+        spec = agents.get(token, 'default')
+        name, kwargs = (spec, {}) if isinstance(spec, (str, type)) else spec
+        specs[token] = (name, dict(kwargs, executor=executor))
+
+    return specs
+
+
+async def play_game_async(
+        lst_token: Sequence[str], schema: dict, seed: int,
+        max_turns: int=1000, agents: Optional[dict]=None,
+        yield_every: int=16) -> GameResult:
+    """
+    Play a single game like simulation.play_game, awaiting the decisions of
+    the agents. Yields to the other games every yield_every turns even if no
+    agent had to wait
+    """
+    board = Board(lst_token, schema=schema, seed=seed, agents=agents)
+
+    landings = Counter()
+    turns = 0
+    while not board.is_over and turns < max_turns:
+        player = await board.aplay_next_turn()
+        landings[board.player_location[player.token]] += 1
+        turns += 1
+        if not turns % yield_every:
+            await asyncio.sleep(0)
+
+    return game_result(board, seed, turns, landings)
+
+
+async def play_games_async(
+        lst_token: Sequence[str], schema: dict, seeds: Sequence[int],
+        max_turns: int=1000, agents: Optional[dict]=None,
+        max_concurrency: int=64) -> SimulationSummary:
+    """
+    Interleave the games on the running event loop, with at most
+    max_concurrency of them in progress at once
+    """
+    slots = asyncio.Semaphore(max_concurrency)
+
+    async def play(seed: int) -> GameResult:
+        async with slots:
+            return await play_game_async(
+                lst_token, schema, seed, max_turns, agents)
+
+    summary = SimulationSummary()
+    for result in await asyncio.gather(*[play(seed) for seed in seeds]):
+        summary.add(result)
+
+    return summary
+
+
+def play_games_concurrently(
+        lst_token: Sequence[str], schema: dict, seeds: Sequence[int],
+        max_turns: int=1000, agents: Optional[dict]=None,
+        max_concurrency: int=64, max_threads: Optional[int]=None
+        ) -> SimulationSummary:
+    """
+    Play a chunk of games on an event loop in the current process. Agent
+    decisions run in a pool of max_threads threads
+    """
+    with ThreadPoolExecutor(max_workers=max_threads) as executor:
+        return asyncio.run(play_games_async(
+            lst_token, schema, seeds, max_turns,
+            with_executor(agents, lst_token, executor), max_concurrency))
+
+
+def run_async_simulation(
+        n_games: int, lst_token: Sequence[str], schema: dict, seed: int=0,
+        max_turns: int=1000, agents: Optional[dict]=None,
+        max_workers: Optional[int]=None, chunksize: int=100,
+        max_concurrency: int=64, max_threads: Optional[int]=None
+        ) -> SimulationSummary:
+    """
+    Run n_games across a process pool like simulation.run_simulation. Each
+    worker interleaves the games of its chunk on an event loop, so agents
+    waiting on slow decisions do not leave the cores idle. Agents are given
+    by name or class, as for Board
+    """
+    max_workers = max_workers or os.cpu_count()
+    lst_seeds = [
+        range(seed + i, seed + min(i + chunksize, n_games))
+        for i in range(0, n_games, chunksize)]
+
+    summary = SimulationSummary()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                play_games_concurrently, lst_token, schema, seeds, max_turns,
+                agents, max_concurrency, max_threads)
+            for seeds in lst_seeds]
+
+        for future in futures:
+            summary.merge(future.result())
+
+    return summary
+
+
+def play_games_batched(
+        lst_token: Sequence[str], schema: dict, seeds: Sequence[int],
+        batch_agent: AbstractBatchAgent, batch_tokens: Sequence[str],
+        max_turns: int=1000, features=decision_features) -> SimulationSummary:
+    """
+    Play the games in lockstep, one turn per game per round. The decisions
+    of the batch_tokens players pending across all games are handed to the
+    batch agent in a single call, with the features of each decision from
+    features(board, player, tile, out). Other players decide on their own
+    """
+    boards = [Board(lst_token, schema=schema, seed=seed) for seed in seeds]
+    landings = [Counter() for _ in boards]
+    batch_tokens = set(batch_tokens)
+
+    # Feature rows of the pending decisions, allocated on the first batch
+    buffer = None
+    active = list(range(len(boards)))
+    while active:
+        pending = []
+        movers = {}
+        for i in active:
+            board = boards[i]
+            player, tile, lst_optional = board.begin_turn()
+            movers[i] = player
+            if lst_optional and player.token in batch_tokens:
+                pending.append((board, player, tile, lst_optional))
+            elif lst_optional:
+                board.complete_turn(
+                    tile, player, player.cp_take_action(lst_optional))
+
+        if pending:
+            if buffer is None:
+                row = features(*pending[0][:3])
+                buffer = np.empty((len(boards), len(row)), dtype=row.dtype)
+            batch = buffer[:len(pending)]
+            for k, (board, player, tile, _) in enumerate(pending):
+                features(board, player, tile, out=batch[k])
+
+            choices = batch_agent.cp_take_actions(
+                [p[3] for p in pending], batch)
+            for (board, player, tile, lst_optional), choice in zip(
+                    pending, choices):
+                board.complete_turn(tile, player, lst_optional[choice])
+
+        for i, player in movers.items():
+            landings[i][boards[i].player_location[player.token]] += 1
+
+        active = [
+            i for i in active
+            if not boards[i].is_over and boards[i].nturn < max_turns]
+
+    summary = SimulationSummary()
+    for board, seed, landing in zip(boards, seeds, landings):
+        summary.add(game_result(board, seed, board.nturn, landing))
+
+    return summary
@@ -0,0 +1,205 @@
+import glob
+import multiprocessing
+import os
+import queue as _queue
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from actionspace import get_action_space
+from board import Board
+from encoder import BoardEncoder
+from layout import compile_layout
+from simulation import game_result
+
+
+def record_dtype(encoder: BoardEncoder) -> np.dtype:
+    """
+    Record of one decision: the board encoded from the point of view of the
+    deciding player, the legal actions as a mask over the ids of the action
+    space of the layout, the id of the action taken and the outcome of the
+    game for the player, 1 for a win
+    """
+    space = get_action_space(encoder.layout)
+    return np.dtype([
+        ('game', '<u4'), ('turn', '<u4'), ('player', 'i1'),
+        ('state', '<f4', (encoder.size,)),
+        ('legal', '?', (len(space),)), ('action', '<u2'),
+        ('outcome', '<f4')])
+
+
+def selfplay_game(
+        lst_token: Sequence[str], schema: dict, seed: int,
+        encoder: BoardEncoder, max_turns: int=1000,
+        agents: Optional[dict]=None) -> np.ndarray:
+    """
+    Play a game and return the records of every decision taken in it
+    """
+    board = Board(lst_token, schema=schema, seed=seed, agents=agents)
+    order = {token: i for i, token in enumerate(board.players)}
+
+    # Records are written into a buffer grown as the game goes on
+    records = np.zeros(64, dtype=record_dtype(encoder))
+    n = 0
+    while not board.is_over and board.nturn < max_turns:
+        player, tile, lst_optional = board.begin_turn()
+        if not lst_optional:
+            continue
+
+        if n == len(records):
+            records = np.resize(records, 2 * n)
+        record = records[n]
+        encoder.encode(board, player, out=record['state'])
+        legal = board.legal
+        record['legal'] = False
+        record['legal'][list(legal.ids)] = True
+
+        action = player.cp_take_action(lst_optional)
+        record['game'] = seed
+        record['turn'] = board.nturn
+        record['player'] = order[player.token]
+        record['action'] = legal.id_of(action)
+        n += 1
+
+        board.complete_turn(tile, player, action)
+
+    records = records[:n]
+    winner = game_result(board, seed, board.nturn, None).winner
+    if winner is not None:
+        records['outcome'] = records['player'] == order[winner]
+
+    return records
+
+
+class ShardWriter:
+    """
+    Writes records to rotating .npy shards of shard_size records each. Records
+    are copied into a preallocated shard buffer, so memory stays bounded by
+    one shard whatever the number of games
+    """
+    def __init__(
+            self, directory: str, dtype: np.dtype, shard_size: int=65536,
+            prefix: str='shard') -> None:
+        self.directory = directory
+        self.prefix = prefix
+        self.paths = []
+
+        self._buffer = np.zeros(shard_size, dtype=dtype)
+        self._size = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, records: np.ndarray) -> None:
+        """
+        Append records, writing out the shard whenever it fills up
+        """
+        while len(records):
+            n = min(len(records), len(self._buffer) - self._size)
+            self._buffer[self._size:self._size + n] = records[:n]
+            self._size += n
+            records = records[n:]
+            if self._size == len(self._buffer):
+                self.flush()
+
+    def flush(self) -> None:
+        """
+        Write out the records of the current shard and start a new one
+        """
+        if not self._size:
+            return
+
+        path = os.path.join(
+            self.directory, f'{self.prefix}_{len(self.paths):05d}.npy')
+        np.save(path, self._buffer[:self._size])
+        self.paths.append(path)
+        self._size = 0
+
+    def close(self) -> None:
+        self.flush()
+
+
+def _selfplay_worker(
+        queue, lst_token: Sequence[str], schema: dict, seeds: Sequence[int],
+        max_turns: int, agents: Optional[dict]) -> None:
+    """
+    Play the games and send the records of each to the writer. A None marks
+    the end of the games of this worker
+    """
+    try:
+        encoder = BoardEncoder(compile_layout(schema), len(lst_token))
+        for seed in seeds:
+            queue.put(selfplay_game(
+                lst_token, schema, seed, encoder, max_turns, agents))
+        queue.put(None)
+    except Exception as e:
+        queue.put(e)
+
+
+def run_selfplay(
+        n_games: int, lst_token: Sequence[str], schema: dict,
+        directory: str, seed: int=0, max_turns: int=1000,
+        agents: Optional[dict]=None, max_workers: Optional[int]=None,
+        shard_size: int=65536, queue_size: int=64,
+        poll_interval: float=1.) -> List[str]:
+    """
+    Play n_games self-play games across worker processes and stream their
+    decisions to shards in directory. Game i is seeded with seed + i. The
+    current process is the single writer. Workers block once queue_size games
+    are waiting to be written, which bounds memory when the writer falls
+    behind. The writer checks on the workers every poll_interval seconds
+    without records, and raises if a worker died before finishing its games.
+    Returns the paths of the shards written
+    """
+    max_workers = min(max_workers or os.cpu_count(), n_games)
+    encoder = BoardEncoder(compile_layout(schema), len(lst_token))
+    writer = ShardWriter(directory, record_dtype(encoder), shard_size)
+
+    context = multiprocessing.get_context()
+    queue = context.Queue(maxsize=queue_size)
+    workers = [
+        context.Process(target=_selfplay_worker, args=(
+            queue, lst_token, schema,
+            range(seed + w, seed + n_games, max_workers), max_turns, agents),
+            daemon=True)
+        for w in range(max_workers)]
+    for w in workers:
+        w.start()
+
+    try:
+        running = len(workers)
+        while running:
+            try:
+                records = queue.get(timeout=poll_interval)
+            except _queue.Empty:
+                # Workers flush the queue before exiting, so nothing more is
+                # coming from a worker that failed or from all exited ones
+                exitcodes = [w.exitcode for w in workers]
+                if any(exitcodes) or None not in exitcodes:
+                    raise RuntimeError(
+                        'Self-play workers exited before finishing their '
+                        f'games, exit codes: {exitcodes}')
+                continue
+
+            if records is None:
+                running -= 1
+            elif isinstance(records, Exception):
+                raise records
+            else:
+                writer.write(records)
+    finally:
+        writer.close()
+        for w in workers:
+            if w.is_alive():
+                w.terminate()
+            w.join()
+
+    return writer.paths
+
+
+def load_shards(directory: str, prefix: str='shard') -> List[np.ndarray]:
+    """
+    Memory-map the shards in directory, in the order they were written
+    """
+    return [
+        np.load(path, mmap_mode='r') for path in
+        sorted(glob.glob(os.path.join(directory, f'{prefix}_*.npy')))]
@@ -0,0 +1,242 @@
+import asyncio
+import json
+
+from typing import Callable, Optional, Sequence
+
+from board import Board
+
+
+# Messages are JSON objects, one per line. A client opens a session with
+#   {"type": "join", "tokens": [...], "remote": [...], "seed": int,
+#    "max_turns": int}
+# where remote lists the tokens the client decides for. The other tokens are
+# played by the default agent on the server. On a turn of a remote token the
+# server sends
+#   {"type": "decide", "turn": int, "token": str, "tile": int,
+#    "balance": int, "actions": [[action, params], ...]}
+# and the client answers {"type": "action", "turn": int, "index": int}. Once
+# the game is over the server sends
+#   {"type": "end", "turns": int, "winner": str, "balances": {...}}
+# and closes the connection. Errors are sent as {"type": "error", ...}
+
+
+def encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+class GameServer:
+    """
+    Hosts Board sessions for remote agents on a single event loop. Each
+    connection plays one game. The turns of the server-side players run
+    synchronously, while the turns of remote players wait on the client
+    without blocking the other sessions
+    Options:
+        move_timeout: seconds a client has to answer. A late or invalid
+            answer plays the first action (do nothing) in its place
+        max_sessions: number of games played at once. Further connections
+            wait for a session to finish
+        yield_every: number of server-side turns played before yielding to
+            the other sessions
+        close_timeout: seconds to wait on a client to close the session once
+            the game is over
+    """
+    def __init__(
+            self, schema: dict, host: str='127.0.0.1', port: int=0,
+            move_timeout: float=1., max_sessions: int=10000,
+            yield_every: int=16, close_timeout: float=1.) -> None:
+        self.schema = schema
+        self.host = host
+        self.port = port
+        self.move_timeout = move_timeout
+        self.yield_every = yield_every
+        self.close_timeout = close_timeout
+
+        self._slots = asyncio.Semaphore(max_sessions)
+        self._server = None
+
+        # Session statistics
+        self.sessions = 0
+        self.active = 0
+        self.timeouts = 0
+        self.invalid = 0
+
+    async def start(self) -> None:
+        """
+        Start listening. The port is assigned on start if given as 0
+        """
+        self._server = await asyncio.start_server(
+            self.handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self) -> "GameServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def handle(
+            self, reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter) -> None:
+        """
+        Play one game with the connected client
+        """
+        try:
+            async with self._slots:
+                self.sessions += 1
+                self.active += 1
+                try:
+                    await self.play_session(reader, writer)
+                finally:
+                    self.active -= 1
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            await self.linger(reader, writer)
+
+    async def linger(
+            self, reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter) -> None:
+        """
+        Close the session once the client is done. Answers still in flight
+        from a slow client are read and dropped, as closing with unread input
+        resets the connection before the client reads the end of the game
+        """
+        try:
+            if writer.can_write_eof():
+                writer.write_eof()
+            while await asyncio.wait_for(
+                    reader.read(4096), self.close_timeout):
+                pass
+        except (ConnectionError, asyncio.TimeoutError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def send(self, writer: asyncio.StreamWriter, message: dict) -> None:
+        """
+        Send a message, waiting while the client is slow to read so that
+        output does not pile up in memory
+        """
+        writer.write(encode(message))
+        await writer.drain()
+
+    async def play_session(
+            self, reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter) -> None:
+        """
+        Run the game requested by the join message of the client
+        """
+        try:
+            join = json.loads(await reader.readline())
+            tokens = join['tokens']
+            if not tokens or len(set(tokens)) != len(tokens):
+                raise ValueError('Tokens must be non-empty and unique')
+            board = Board(tokens, self.schema, seed=join.get('seed'))
+            remote = set(join.get('remote', ()))
+            max_turns = join.get('max_turns', 1000)
+        except (ValueError, KeyError, TypeError) as e:
+            await self.send(writer, {'type': 'error', 'reason': repr(e)})
+            return
+
+        local_turns = 0
+        while not board.is_over and board.nturn < max_turns:
+            player, tile, lst_optional = board.begin_turn()
+            if not lst_optional:
+                continue
+
+            if player.token in remote:
+                action = await self.remote_action(
+                    reader, writer, board, player, lst_optional)
+            else:
+                action = player.cp_take_action(lst_optional)
+                local_turns += 1
+                if local_turns % self.yield_every == 0:
+                    await asyncio.sleep(0)
+            board.complete_turn(tile, player, action)
+
+        winner = max(board.solvent, key=lambda p: p.balance)
+        await self.send(writer, {
+            'type': 'end', 'turns': board.nturn, 'winner': winner.token,
+            'balances': {p.token: p.balance for p in board.players.values()}})
+
+    async def remote_action(
+            self, reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter, board: Board, player,
+            lst_optional: list) -> tuple:
+        """
+        Ask the client to pick one of the actions. The client has
+        move_timeout seconds to answer, however many stale answers it sends
+        """
+        turn = board.nturn
+        await self.send(writer, {
+            'type': 'decide', 'turn': turn, 'token': player.token,
+            'tile': board.player_location[player.token],
+            'balance': player.balance,
+            'actions': [[a.action, a.params] for a in lst_optional]})
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.move_timeout
+        try:
+            while True:
+                answer = json.loads(await asyncio.wait_for(
+                    reader.readline(), max(deadline - loop.time(), 0)))
+                # Skip late answers to earlier turns
+                if answer.get('turn') != turn:
+                    continue
+                index = answer.get('index')
+                if type(index) is int and 0 <= index < len(lst_optional):
+                    return lst_optional[index]
+                self.invalid += 1
+                break
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+        except (ValueError, AttributeError):
+            self.invalid += 1
+
+        return lst_optional[0]
+
+
+async def play_remote(
+        host: str, port: int, tokens: Sequence[str], remote: Sequence[str],
+        policy: Callable[[dict], int], seed: Optional[int]=None,
+        max_turns: int=1000) -> dict:
+    """
+    Client playing one game on a GameServer. policy picks the index of an
+    action given a decide message, and may be a coroutine function. Returns
+    the end message
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(encode({
+            'type': 'join', 'tokens': list(tokens), 'remote': list(remote),
+            'seed': seed, 'max_turns': max_turns}))
+        await writer.drain()
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError('Server closed the session')
+
+            message = json.loads(line)
+            if message['type'] != 'decide':
+                return message
+
+            index = policy(message)
+            if asyncio.iscoroutine(index):
+                index = await index
+            # The server may have moved on and ended the game while the policy
+            # was deciding. The end message is still there to be read
+            try:
+                writer.write(encode({
+                    'type': 'action', 'turn': message['turn'],
+                    'index': index}))
+                await writer.drain()
+            except ConnectionError:
+                pass
+    finally:
+        writer.close()
@@ -0,0 +1,152 @@
+import os
+
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence
+
+from board import Board
+from eventlog import EventLog
+
+
+GameResult = namedtuple(
+    'GameResult', ['seed', 'winner', 'turns', 'balances', 'landings'])
+
+
+class SimulationSummary:
+    """
+    Aggregated results of a batch of games
+    """
+    def __init__(self):
+        self.games = 0
+        self.turns = 0
+        # Games won per token. Games hitting the turn cap with a tie on the
+        # balance have no winner
+        self.wins = Counter()
+        # Sum of the final balances per token
+        self.balances = Counter()
+        # Number of times a turn ended on each tile index
+        self.landings = Counter()
+
+    def add(self, result: GameResult) -> None:
+        """
+        Add the result of a single game
+        """
+        self.games += 1
+        self.turns += result.turns
+        if result.winner is not None:
+            self.wins[result.winner] += 1
+        self.balances.update(result.balances)
+        self.landings.update(result.landings)
+
+    def merge(self, other: "SimulationSummary") -> None:
+        """
+        Merge the results of another batch into this one
+        """
+        self.games += other.games
+        self.turns += other.turns
+        self.wins.update(other.wins)
+        self.balances.update(other.balances)
+        self.landings.update(other.landings)
+
+    @property
+    def mean_turns(self) -> float:
+        return self.turns / self.games if self.games else 0.
+
+    @property
+    def win_rate(self) -> dict:
+        return {k: v / self.games for k, v in self.wins.items()}
+
+
+def play_game(
+        lst_token: Sequence[str], schema: dict, seed: int,
+        max_turns: int=1000, log: Optional[EventLog]=None,
+        agents: Optional[dict]=None,
+        turn_order: Optional[Sequence[str]]=None) -> GameResult:
+    """
+    Play a single game until all but one player are bankrupt or the turn cap
+    is reached. At the turn cap the player with the highest balance wins.
+    Events are recorded to log under the seed as game id. Agents and the turn
+    order are given as for Board
+    """
+    if log is not None:
+        log.game = seed
+    board = Board(
+        lst_token, schema=schema, seed=seed, log=log, agents=agents,
+        turn_order=turn_order)
+
+    landings = Counter()
+    turns = 0
+    while not board.is_over and turns < max_turns:
+        player = board.play_next_turn()
+        landings[board.player_location[player.token]] += 1
+        turns += 1
+
+    return game_result(board, seed, turns, landings)
+
+
+def game_result(
+        board: Board, seed: int, turns: int, landings: Counter) -> GameResult:
+    """
+    Result of a finished game. At the turn cap the player with the highest
+    balance wins
+    """
+    balances = {p.token: p.balance for p in board.players.values()}
+    solvent = board.solvent
+    if len(solvent) == 1:
+        winner = solvent[0].token
+    else:
+        top = max(p.balance for p in solvent)
+        leaders = [p.token for p in solvent if p.balance == top]
+        winner = leaders[0] if len(leaders) == 1 else None
+
+    return GameResult(seed, winner, turns, balances, landings)
+
+
+def play_games(
+        lst_token: Sequence[str], schema: dict, seeds: Sequence[int],
+        max_turns: int=1000, log_path: Optional[str]=None
+        ) -> SimulationSummary:
+    """
+    Play a chunk of games in the current process and return the aggregate.
+    Events are appended to the event log file at log_path, if given
+    """
+    summary = SimulationSummary()
+    log = EventLog(log_path) if log_path else None
+    try:
+        for seed in seeds:
+            summary.add(play_game(lst_token, schema, seed, max_turns, log))
+    finally:
+        if log is not None:
+            log.close()
+
+    return summary
+
+
+def run_simulation(
+        n_games: int, lst_token: Sequence[str], schema: dict, seed: int=0,
+        max_turns: int=1000, max_workers: Optional[int]=None,
+        chunksize: int=100, log_dir: Optional[str]=None) -> SimulationSummary:
+    """
+    Run n_games independent games across a process pool and merge the
+    results. Game i is seeded with seed + i, so the outcome does not depend on
+    the number of workers or the order in which chunks complete. With log_dir
+    set, each chunk writes its events to events_<first seed>.bin in log_dir
+    """
+    max_workers = max_workers or os.cpu_count()
+    lst_seeds = [
+        range(seed + i, seed + min(i + chunksize, n_games))
+        for i in range(0, n_games, chunksize)]
+
+    summary = SimulationSummary()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                play_games, lst_token, schema, seeds, max_turns,
+                os.path.join(log_dir, f'events_{seeds[0]}.bin')
+                if log_dir else None)
+            for seeds in lst_seeds]
+
+        for future in futures:
+            summary.merge(future.result())
+
+    return summary
@@ -0,0 +1,69 @@
+from array import array
+
+from board import Board
+
+
+# Owner column value for tiles held by the bank
+NO_OWNER = -1
+
+
+class BoardState:
+    """
+    Compact, array-backed copy of the mutable state of a Board. Tile columns
+    are indexed by tile idx and player columns by the order of board.players,
+    so a BoardState takes a few hundred bytes in place of a graph of tile and
+    player objects
+    """
+    __slots__ = (
+        'owner', 'house', 'hotel', 'position', 'nround', 'balance', 'jail',
+        'bankrupt', 'jail_free')
+
+    def __init__(self, n_tiles: int=40, n_players: int=4):
+        # Tile columns
+        self.owner = array('b', [NO_OWNER] * n_tiles)
+        self.house = array('B', [0] * n_tiles)
+        self.hotel = array('B', [0] * n_tiles)
+
+        # Player columns
+        self.position = array('B', [0] * n_players)
+        self.nround = array('H', [1] * n_players)
+        self.balance = array('l', [0] * n_players)
+        self.jail = array('B', [0] * n_players)
+        self.bankrupt = array('B', [0] * n_players)
+        self.jail_free = array('B', [0] * n_players)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the columns in bytes
+        """
+        return sum(
+            getattr(self, k).itemsize * len(getattr(self, k))
+            for k in self.__slots__)
+
+    @classmethod
+    def from_board(cls, board: Board) -> "BoardState":
+        """
+        Capture the state of the board
+        """
+        state = cls(len(board.lst_tile), len(board.players))
+        state.capture(board)
+
+        return state
+
+    def capture(self, board: Board) -> None:
+        """
+        Overwrite this state with the state of the board
+        """
+        snapshot = board.snapshot()
+        for k in self.__slots__:
+            getattr(self, k)[:] = array(
+                getattr(self, k).typecode, getattr(snapshot, k))
+
+    def apply(self, board: Board) -> None:
+        """
+        Restore this state onto a board built from the same schema and
+        players. Ownership bookkeeping (player assets and color groups) is
+        updated and terrain values are invalidated for the tiles that changed
+        """
+        board.restore_columns(self)
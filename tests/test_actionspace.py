@@ -0,0 +1,141 @@
+import json
+import os
+import unittest
+
+import board
+
+from actionspace import get_action_space
+from common import DATADIR
+
+
+class TestActionSpace(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+        self.lst_token = ['apple','boot','car','dog']
+        self.new_board = board.Board(self.lst_token, self.schema, seed=0)
+
+    @staticmethod
+    def price(tile, action) -> int:
+        if action.action == 'acquire':
+            return tile.cost['title']
+        if action.action == 'add_construct':
+            return tile.cost[action.params['type']] * action.params['amt']
+        return 0
+
+    def testMatchesTileActions(self):
+        """
+        Legal actions are the actions of Tile.get_action the player can
+        afford, for every purchasable tile, construct and balance
+        """
+        gameboard = self.new_board
+        space = gameboard.action_space
+        apple = gameboard.players['apple']
+
+        for idx in gameboard.layout.purchasable:
+            tile = gameboard.lst_tile[idx]
+            states = [(None, 0, 0), ('apple', 0, 0)]
+            if gameboard.layout.kinds[idx] == 'property':
+                states += [('apple', h, 0) for h in range(1, 5)]
+                states.append(('apple', 4, 1))
+
+            for owner, house, hotel in states:
+                tile.owner = owner
+                if hasattr(tile, 'house'):
+                    tile.house, tile.hotel = house, hotel
+                for balance in (0, 50, 150, 400, 1500):
+                    apple.balance = balance
+                    expected = [
+                        action for action in tile.get_action('apple')
+                        if balance >= self.price(tile, action)]
+                    legal = space.legal(tile, 'apple', balance)
+
+                    self.assertEqual(list(legal.actions), expected)
+                    self.assertEqual(
+                        [space.actions[i] for i in legal.ids], expected)
+                    self.assertEqual(
+                        legal.mask, sum(1 << i for i in legal.ids))
+
+    def testTablesShared(self):
+        """
+        Landings on a tile in the same state get the same tuple of actions,
+        and boards of the same layout share the action space
+        """
+        gameboard = self.new_board
+        apple = gameboard.players['apple']
+        tile = gameboard.lst_tile[gameboard.layout.purchasable[0]]
+
+        first = gameboard.get_actions(tile, apple)[1]
+        second = gameboard.get_actions(tile, apple)[1]
+        self.assertIs(first.actions, second.actions)
+
+        other = board.Board(self.lst_token, self.schema, seed=1)
+        self.assertIs(other.action_space, gameboard.action_space)
+
+        # A copy of the schema compiles to the same layout and action space
+        other = board.Board(self.lst_token, json.loads(json.dumps(
+            self.schema)), seed=1)
+        self.assertIs(other.action_space, gameboard.action_space)
+
+    def testIdsStable(self):
+        """
+        Action ids depend on the layout only, and do nothing is id 0
+        """
+        space = self.new_board.action_space
+        layout = self.new_board.layout
+        self.assertIsNone(space.actions[0].action)
+        self.assertEqual(len(space), len(space.index) + 1)
+
+        idx = layout.purchasable[0]
+        acquire = space.index[(idx, 'acquire', None, 0)]
+        self.assertEqual(space.tiles[acquire], idx)
+        self.assertEqual(space.actions[acquire].action, 'acquire')
+
+    def testReadOnlyParams(self):
+        """
+        The shared actions cannot be changed through their params
+        """
+        space = self.new_board.action_space
+        with self.assertRaises(TypeError):
+            space.actions[1].params['type'] = 'hotel'
+        with self.assertRaises(TypeError):
+            space.pay('boot').params['payee'] = 'car'
+
+    def testSnapshotKeepsLegal(self):
+        """
+        Restoring a snapshot restores the legal actions of its landing, and
+        their ids point back at the actions offered
+        """
+        gameboard = self.new_board
+        while not gameboard.begin_turn()[2]:
+            pass
+        legal = gameboard.legal
+        snapshot = gameboard.snapshot()
+        for action in legal.actions:
+            self.assertEqual(
+                gameboard.action_space.actions[legal.id_of(action)], action)
+
+        for _ in range(10):
+            gameboard.play_next_turn()
+        gameboard.restore(snapshot)
+        self.assertIs(gameboard.legal, legal)
+
+    def testRentMandatory(self):
+        """
+        Landing on a tile owned by another player offers only the rent,
+        paid to the owner
+        """
+        gameboard = self.new_board
+        apple = gameboard.players['apple']
+        tile = gameboard.lst_tile[gameboard.layout.purchasable[0]]
+        tile.owner = 'boot'
+
+        mandatory, legal = gameboard.get_actions(tile, apple)
+        self.assertEqual([a.action for a in mandatory], ['pay'])
+        self.assertEqual(mandatory[0].params['payee'], 'boot')
+        self.assertEqual(legal.ids, (0,))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import json
 import os
+import random
 import unittest
 from unittest.loader import getTestCaseNames
 
@@ -9,9 +10,11 @@ import player
 
 from agent.agent_factory import create_player_agent
 from agent.default_agent import NaiveAgent
+from agent.liquidation import exhaustive_min_surplus, min_surplus_subset
+from agent.mcts_agent import MonteCarloAgent
 from agent.metaclass import Agent, BaseAgent, AbstractAgent
-from tests.test_board import allocate_sequence_ownership
 
+from board import allocate_sequence_ownership
 from common import ROOTDIR, DATADIR
 
 
@@ -85,4 +88,116 @@ class TestAgent(unittest.TestCase):
         action(tileon, apple, **choice.params)
         self.assertTrue(
             any([tileon.construct_count['house'] > constructs['house'],
-                tileon.construct_count['hotel'] > constructs['hotel']]))
\ No newline at end of file
+                tileon.construct_count['hotel'] > constructs['hotel']]))
+
+    def test_liquidation_matches_exhaustive_search(self):
+        """
+        The knapsack solver picks the same assets as the exhaustive search,
+        including its tie-breaking
+        """
+        rng = random.Random(0)
+        assets = [(t.idx, t.cost['title'])
+            for t in self.new_board.lst_tile if hasattr(t, 'cost')]
+
+        for _ in range(200):
+            lst = rng.sample(assets, rng.randint(0, 10))
+            amt = rng.randint(0, 12000)
+            self.assertEqual(
+                min_surplus_subset(lst, amt),
+                exhaustive_min_surplus(lst, amt))
+
+    def test_liquidation_all_purchasable_tiles(self):
+        """
+        The knapsack solver handles all 28 purchasable tiles
+        """
+        assets = [(t.idx, t.cost['title'])
+            for t in self.new_board.lst_tile if hasattr(t, 'cost')]
+        total = sum(x[1] for x in assets)
+
+        self.assertEqual(len(assets), 28)
+        self.assertEqual(len(min_surplus_subset(assets, total)), 28)
+        self.assertIsNone(min_surplus_subset(assets, total + 1))
+
+
+class TestMonteCarloAgent(unittest.TestCase):
+    def setUp(self):
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+        self.lst_token = ['apple','boot','car','dog']
+        self.new_board = board.Board(
+            self.lst_token, schema=self.schema,
+            agents={'apple': ('mcts', {'iterations': 8, 'rollout_depth': 8})})
+
+    def test_agent_registered(self):
+        """
+        The Monte Carlo agent is created through the agent factory
+        """
+        apple = self.new_board.players['apple']
+
+        self.assertIsInstance(apple, MonteCarloAgent)
+        self.assertIs(apple.board, self.new_board)
+        self.assertEqual(apple.iterations, 8)
+
+    def test_take_action_leaves_board_untouched(self):
+        """
+        The search restores the board, including the random number generator,
+        before returning one of the available actions
+        """
+        gameboard = self.new_board
+        apple = gameboard.players['apple']
+        gameboard.move_to_index(apple, 1)
+        lst_actions = [
+            a for a in gameboard.lst_tile[1].get_action('apple')]
+
+        snapshot = gameboard.snapshot()
+        choice = apple.cp_take_action(lst_actions)
+
+        self.assertIn(choice, lst_actions)
+        self.assertEqual(gameboard.snapshot(), snapshot)
+        self.assertEqual(apple.latency['decisions'], 1)
+
+    def test_search_starts_afresh(self):
+        """
+        Every decision is searched from scratch with the iteration budget,
+        even when the same decision came up before
+        """
+        gameboard = self.new_board
+        apple = gameboard.players['apple']
+        gameboard.move_to_index(apple, 1)
+        lst_actions = gameboard.lst_tile[1].get_action('apple')
+
+        apple.cp_take_action(lst_actions)
+        first = apple.node
+        apple.cp_take_action(lst_actions)
+
+        self.assertIsNot(apple.node, first)
+        self.assertEqual(sum(apple.node.visits), apple.iterations)
+
+    def test_asset_sale_covers_shortfall(self):
+        """
+        The liquidation picked by the search covers the amount
+        """
+        gameboard = allocate_sequence_ownership(self.new_board)
+        apple = gameboard.players['apple']
+
+        sale = apple.cp_asset_sale(2500)
+        proceeds = sum(gameboard.lst_tile[idx].cost['title'] for idx in sale)
+
+        self.assertGreaterEqual(proceeds, 2500)
+
+    def test_time_budget(self):
+        """
+        Every choice is simulated at least once, then the time budget stops
+        the search
+        """
+        gameboard = self.new_board
+        apple = gameboard.players['apple']
+        apple.iterations = 10 ** 6
+        apple.time_budget = 0.05
+        gameboard.move_to_index(apple, 1)
+
+        apple.cp_take_action(gameboard.lst_tile[1].get_action('apple'))
+
+        self.assertLess(apple.latency['max'], 1.)
+        self.assertTrue(all(apple.node.visits))
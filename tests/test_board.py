@@ -1,40 +1,16 @@
 import json
 import os
+import random
 import unittest
 
 import board
 import player
 import tile
 
+from board import allocate_sequence_ownership
 from common import ROOTDIR, DATADIR
 
 
-def allocate_sequence_ownership(board: board.Board) -> None:
-    """
-    Used in conjunction with the test
-    to calculate the overall expected terrain value
-    """
-    lst_players = [x for x in board.players.values()]
-    n = len(lst_players)
-    i = 0
-
-    # Sequentially allocate ownership of tiles
-    for tile in board.lst_tile:
-        if hasattr(tile, 'owner'):
-            player = lst_players[i % n]
-            # Execute the purchase
-            tile.acquire(player.token)
-            player.asset_acquire(tile)
-            # Update the colorgrp ownership dct
-            colorgrp = board.colorgrp
-            colorgrp[tile.color][player.token] = \
-                colorgrp[tile.color].get(player.token, 0) + 1
-
-            i += 1
-
-    return board
-
-
 class TestGameBoard(unittest.TestCase):
     def setUp(self) -> None:
         # Load the monopoly-sg schema
@@ -224,3 +200,184 @@ class TestPlayGame(TestGameBoard):
 
         board.player_sell(tile, player)
         self.assertEqual(player.balance, 2100)
+
+class TestDiceDistribution(unittest.TestCase):
+    def testDistributionSumsToOne(self):
+        """
+        The outcome distribution covers every roll sequence for any dice,
+        but for the rolls ending in jail
+        """
+        for dice_type, n in [('quad', 2), ('hexa', 2), ('octa', 3)]:
+            dice = board.Dice(dice_type=dice_type, n=n)
+            p_double = len(dice.face) ** (1 - n)
+            self.assertAlmostEqual(
+                sum(dice.distribution.values()),
+                1. - p_double ** (dice.rerolls + 1))
+
+    def testDistributionRange(self):
+        """
+        Three octahedral dice move at least 1+1+2 steps. The most is two
+        rolls of three eights and a last roll of 8+8+7
+        """
+        dist = board.Dice(dice_type='octa', n=3).distribution
+
+        self.assertEqual(min(dist), 4)
+        self.assertEqual(max(dist), 71)
+
+    def testDistributionIsMemoized(self):
+        """
+        The distribution is computed once per dice format
+        """
+        one = board.outcome_distribution(6, 2, 2)
+        two = board.outcome_distribution(6, 2, 2)
+
+        self.assertIs(one, two)
+        self.assertIsNot(board.outcome_distribution(6, 2, 1), one)
+
+class TestTerrainValueCache(TestGameBoard):
+    def assertCacheIsFresh(self, board: board.Board) -> None:
+        """
+        Cached terrain values match a computation from scratch
+        """
+        cached = {}
+        for pos in range(40):
+            board.player_location = {p: pos for p in self.lst_token}
+            cached[pos] = [board.calculate_terrain_value(p)
+                for p in board.players.values()]
+
+        board.index_terrain()
+        for pos in range(40):
+            board.player_location = {p: pos for p in self.lst_token}
+            self.assertListEqual(cached[pos], [
+                board.calculate_terrain_value(p)
+                for p in board.players.values()])
+
+    def testInvalidateOnBuyConstructSell(self):
+        """
+        Buying, building on and selling a tile refreshes the terrain values
+        """
+        board = allocate_sequence_ownership(self.new_board)
+        apple = board.players['apple']
+        boot = board.players['boot']
+        self.assertCacheIsFresh(board)
+
+        # Jurong East Station, owned by boot
+        board.player_sell(board.lst_tile[25], boot)
+        self.assertCacheIsFresh(board)
+
+        board.player_buy(board.lst_tile[25], apple)
+        self.assertCacheIsFresh(board)
+
+        # Collyer Quay, owned by apple
+        board.player_construct(board.lst_tile[24], apple, type='house', amt=2)
+        self.assertCacheIsFresh(board)
+
+    def testValueChangesWithOwnership(self):
+        """
+        Landing on tiles owned by other players costs more than landing on
+        unowned tiles. Handing out the tiles refreshes the terrain values
+        """
+        board = self.new_board
+        apple = board.players['apple']
+        before = board.calculate_terrain_value(apple)
+
+        allocate_sequence_ownership(board)
+
+        self.assertGreater(board.calculate_terrain_value(apple), before)
+
+class TestSnapshot(TestGameBoard):
+    def testSnapshotIsImmutable(self):
+        """
+        A snapshot is a hashable structure of tuples
+        """
+        snapshot = self.new_board.snapshot()
+
+        self.assertIsInstance(hash(snapshot[:-1]), int)
+
+    def testRestoreReplaysTheSameGame(self):
+        """
+        Restoring a snapshot, random number generator included, plays out the
+        same turns again
+        """
+        gameboard = self.new_board
+        for _ in range(10):
+            gameboard.play_next_turn()
+
+        snapshot = gameboard.snapshot()
+        for _ in range(20):
+            gameboard.play_next_turn()
+        after = gameboard.snapshot()
+
+        gameboard.restore(snapshot)
+        self.assertEqual(gameboard.snapshot(), snapshot)
+
+        for _ in range(20):
+            gameboard.play_next_turn()
+        self.assertEqual(gameboard.snapshot(), after)
+
+    def testRestoreKeepsBookkeeping(self):
+        """
+        Player assets and color group counts follow the restored ownership
+        """
+        gameboard = self.new_board
+        snapshot = gameboard.snapshot()
+        apple = gameboard.players['apple']
+
+        gameboard.player_buy(gameboard.lst_tile[1], apple)
+        gameboard.restore(snapshot)
+
+        self.assertIsNone(gameboard.lst_tile[1].owner)
+        self.assertListEqual(apple.assets['purple'], [])
+        self.assertEqual(gameboard.colorgrp['purple']['apple'], 0)
+        self.assertEqual(apple.balance, 1500)
+
+    def testRestoreKeepsAssetOrder(self):
+        """
+        Assets are restored in the order the player held them, which
+        liquidation walks
+        """
+        gameboard = self.new_board
+        apple = gameboard.players['apple']
+        for idx in (3, 1, 5, 39):
+            gameboard.player_buy(gameboard.lst_tile[idx], apple)
+        order = [t.idx for lst in apple.assets.values() for t in lst]
+        snapshot = gameboard.snapshot()
+
+        for idx in (3, 1):
+            gameboard.player_sell(gameboard.lst_tile[idx], apple)
+        gameboard.restore(snapshot)
+
+        self.assertListEqual(
+            [t.idx for lst in apple.assets.values() for t in lst], order)
+        self.assertEqual(gameboard.snapshot(), snapshot)
+
+class TestSeededBoard(TestGameBoard):
+    def testSameSeedSameGame(self):
+        """
+        Boards built with the same seed play out the same game, regardless of
+        the state of the global random module
+        """
+        one = board.Board(self.lst_token, schema=self.schema, seed=42)
+        for _ in range(50):
+            one.play_next_turn()
+
+        random.seed(0)
+        two = board.Board(self.lst_token, schema=self.schema, seed=42)
+        for _ in range(50):
+            random.random()
+            two.play_next_turn()
+
+        self.assertEqual(one.snapshot(), two.snapshot())
+
+    def testDiceStreamIsIndependent(self):
+        """
+        Drawing cards does not shift the dice rolls of the board
+        """
+        one = board.Board(self.lst_token, schema=self.schema, seed=7)
+        two = board.Board(self.lst_token, schema=self.schema, seed=7)
+        for _ in range(5):
+            two._chance.get_action()
+
+        self.assertListEqual(
+            [one.dice.roll() for _ in range(20)],
+            [two.dice.roll() for _ in range(20)])
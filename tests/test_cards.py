@@ -0,0 +1,154 @@
+import json
+import os
+import unittest
+
+import board
+import cards
+import tile
+
+from common import DATADIR
+
+
+def find_card(fname: str, name: str) -> dict:
+    """
+    Look up a card in a deck schema by name
+    """
+    schema = tile.load_card_schema(os.path.join(DATADIR, fname))
+    return [v for v in schema.values() if v['name'] == name][0]
+
+
+class TestCardEngine(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+        self.lst_token = ['apple','boot','car','dog']
+        self.new_board = board.Board(self.lst_token, schema=self.schema, seed=0)
+        self.apple = self.new_board.players['apple']
+
+    def testCompiledOnce(self):
+        """
+        Card effects are compiled once per card
+        """
+        card = find_card('schema_chance.json', 'Dividend')
+
+        self.assertIs(cards.compile_card(card), cards.compile_card(card))
+        self.assertEqual(cards.compile_card(card).bank, 50)
+
+    def testNearestUtility(self):
+        """
+        Advance to the nearest utility, wrapping around the board, and pay 10
+        times a dice roll to the owner
+        """
+        gameboard = self.new_board
+        card = find_card('schema_chance.json', 'Advance to Nearest Utility')
+        gameboard.player_buy(gameboard.lst_tile[12], gameboard.players['boot'])
+
+        gameboard.move_to_index(self.apple, 36)
+        cards.resolve_card(gameboard, self.apple, card)
+        self.assertEqual(gameboard.player_location['apple'], 12)
+        self.assertEqual(gameboard.player_nround['apple'], 2)
+
+        self.assertEqual(gameboard.card_rent, ('dice', 10))
+
+        utility = gameboard.lst_tile[12]
+        for action in utility.get_action('apple'):
+            gameboard.execute_action(utility, self.apple, action)
+        self.assertIn(1500 - self.apple.balance, range(20, 130, 10))
+
+    def testNearestRailroad(self):
+        """
+        Advance to the nearest railroad and pay twice the rent
+        """
+        gameboard = self.new_board
+        card = find_card('schema_chance.json', 'Advance to Nearest Railroad')
+        gameboard.player_buy(gameboard.lst_tile[25], gameboard.players['boot'])
+
+        gameboard.move_to_index(self.apple, 22)
+        cards.resolve_card(gameboard, self.apple, card)
+        self.assertEqual(gameboard.player_location['apple'], 25)
+
+        station = gameboard.lst_tile[25]
+        for action in station.get_action('apple'):
+            gameboard.execute_action(station, self.apple, action)
+        self.assertEqual(self.apple.balance, 1500 - 2 * 500)
+
+    def testGoBackAndJail(self):
+        """
+        Move back three spaces, or straight to jail
+        """
+        gameboard = self.new_board
+        gameboard.move_to_index(self.apple, 7)
+        cards.resolve_card(gameboard, self.apple,
+            find_card('schema_chance.json', 'Go Back Three Spaces'))
+        self.assertEqual(gameboard.player_location['apple'], 4)
+
+        cards.resolve_card(gameboard, self.apple,
+            find_card('schema_chest.json', 'Go To Jail'))
+        self.assertEqual(gameboard.player_location['apple'], 10)
+        self.assertTrue(self.apple.jail)
+
+    def testPayments(self):
+        """
+        Cards pay and charge the bank, the other players and the constructs
+        """
+        gameboard = self.new_board
+        boot = gameboard.players['boot']
+
+        cards.resolve_card(gameboard, self.apple,
+            find_card('schema_chest.json', "It's Your Birthday"))
+        self.assertEqual(self.apple.balance, 1530)
+        self.assertEqual(boot.balance, 1490)
+
+        cards.resolve_card(gameboard, self.apple,
+            find_card('schema_chance.json', 'Elected Chairman'))
+        self.assertEqual(self.apple.balance, 1380)
+
+        gameboard.player_buy(gameboard.lst_tile[1], self.apple)
+        gameboard.player_construct(
+            gameboard.lst_tile[1], self.apple, type='house', amt=2)
+        balance = self.apple.balance
+        cards.resolve_card(gameboard, self.apple,
+            find_card('schema_chest.json', 'Street Repair'))
+        self.assertEqual(self.apple.balance, balance - 2 * 40)
+
+    def testPayEachStopsAtBankruptcy(self):
+        """
+        A player going bankrupt paying each player pays no one after that
+        """
+        gameboard = self.new_board
+        self.apple.balance = 60
+
+        cards.resolve_card(gameboard, self.apple,
+            find_card('schema_chance.json', 'Elected Chairman'))
+
+        self.assertTrue(self.apple.bankrupt)
+        self.assertEqual(
+            [gameboard.players[t].balance for t in ('boot', 'car', 'dog')],
+            [1550, 1550, 1500])
+
+    def testJailFree(self):
+        """
+        A Get Out Of Jail Free card saves the player from sitting out a turn
+        """
+        gameboard = self.new_board
+        cards.resolve_card(gameboard, self.apple,
+            find_card('schema_chance.json', 'Get Out Of Jail Free'))
+        self.assertEqual(self.apple.favors['jail-free'], 1)
+
+        gameboard.send_to_jail(None, self.apple)
+        while gameboard.play_next_turn() is not self.apple:
+            pass
+
+        # The card was used up: the player moved off the jail tile instead of
+        # sitting out the turn
+        self.assertEqual(self.apple.favors['jail-free'], 0)
+        self.assertFalse(self.apple.jail)
+        self.assertNotEqual(gameboard.player_location['apple'], 10)
+        self.assertEqual(gameboard.snapshot().jail_free[0], 0)
+
+        # and remains in the chance deck to be drawn again
+        deck = [t for t in gameboard.lst_tile
+            if isinstance(t, tile.TileChance)][0]
+        self.assertIn('Get Out Of Jail Free',
+            [deck.schema[k]['name'] for k in deck.deck])
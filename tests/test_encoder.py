@@ -0,0 +1,114 @@
+import json
+import os
+import unittest
+
+import numpy as np
+
+import board
+import encoder
+import scheduler
+
+from agent.batch_agent import LinearBatchAgent
+from common import DATADIR
+from layout import compile_layout
+
+
+class TestBoardEncoder(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+        self.lst_token = ['apple','boot','car','dog']
+        self.new_board = board.Board(self.lst_token, self.schema, seed=0)
+        self.encoder = encoder.BoardEncoder(compile_layout(self.schema))
+
+    def section(self, vector: np.ndarray, name: str) -> np.ndarray:
+        return vector[self.encoder.sections[name]]
+
+    def testLayout(self):
+        """
+        The sections tile the vector and every player has a one-hot position
+        and a full landing distribution
+        """
+        vector = self.encoder.encode(self.new_board)
+
+        self.assertEqual(vector.shape, (self.encoder.size,))
+        self.assertEqual(vector.dtype, np.float32)
+        self.assertEqual(self.section(vector, 'position').sum(), 4)
+        np.testing.assert_allclose(
+            self.section(vector, 'dice').reshape(4, -1).sum(axis=1), 1,
+            rtol=1e-5)
+        # Every tile is held by the bank
+        owner = self.section(vector, 'owner').reshape(-1, 5)
+        self.assertTrue((owner[:, 0] == 1).all())
+
+    def testPointOfView(self):
+        """
+        The deciding player comes first in the player sections
+        """
+        gameboard = self.new_board
+        car = gameboard.players['car']
+        gameboard.player_buy(gameboard.lst_tile[1], car)
+        gameboard.player_construct(
+            gameboard.lst_tile[1], car, type='house', amt=2)
+        gameboard.move_to_index(car, 7)
+        car.jail = True
+
+        vector = self.encoder.encode(gameboard, car)
+
+        owner = self.section(vector, 'owner').reshape(-1, 5)
+        self.assertEqual(owner[0, 1], 1)
+        self.assertEqual(self.section(vector, 'house')[0], 0.5)
+        self.assertEqual(
+            self.section(vector, 'balance')[0], car.balance / 1500)
+        self.assertEqual(self.section(vector, 'position')[7], 1)
+        self.assertListEqual(
+            list(self.section(vector, 'jail')), [1, 0, 0, 0])
+        group = self.section(vector, 'group').reshape(4, -1)
+        self.assertAlmostEqual(group[0].sum(), 0.5)
+        # Seven is the most likely roll
+        dice = self.section(vector, 'dice').reshape(4, -1)
+        self.assertEqual(dice[0, 7], 0)
+        self.assertGreater(dice[0, 14], dice[0, 9])
+
+    def testDiceWrapAround(self):
+        """
+        Rolls longer than a lap add to the probability of the tiles they
+        wrap onto, so no mass is lost
+        """
+        layout = compile_layout(self.schema)
+        octa = encoder.BoardEncoder(layout, dice_type='octa', n=2)
+        self.assertGreater(octa._steps.max(), octa.n_tiles)
+
+        vector = octa.encode(self.new_board)
+        np.testing.assert_allclose(
+            vector[octa.sections['dice']].reshape(4, -1).sum(axis=1), 1,
+            rtol=1e-5)
+
+    def testBatchIntoBuffer(self):
+        """
+        Boards are encoded into the rows of a preallocated buffer
+        """
+        boards = [
+            board.Board(self.lst_token, self.schema, seed=i) for i in range(3)]
+        for b in boards[1:]:
+            for _ in range(10):
+                b.play_next_turn()
+
+        out = np.full((3, self.encoder.size), np.nan, dtype=np.float32)
+        result = self.encoder.encode_batch(boards, out=out)
+
+        self.assertIs(result, out)
+        for k, b in enumerate(boards):
+            np.testing.assert_array_equal(out[k], self.encoder.encode(b))
+
+    def testBatchedGames(self):
+        """
+        The encoder is a feature function for batched decisions
+        """
+        weights = np.zeros((5, self.encoder.size), dtype=np.float32)
+        summary = scheduler.play_games_batched(
+            self.lst_token, self.schema, range(4), LinearBatchAgent(weights),
+            ['apple'], max_turns=50, features=self.encoder)
+
+        self.assertEqual(summary.games, 4)
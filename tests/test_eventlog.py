@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import board
+import eventlog
+import simulation
+
+from common import DATADIR
+
+
+class TestEventLog(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+        self.lst_token = ['apple','boot','car','dog']
+
+    def testFileRoundTrip(self):
+        """
+        Records written across several flushes map back in order
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'events.bin')
+            with eventlog.EventLog(path, capacity=4) as log:
+                for i in range(10):
+                    log.record(i, i % 4, 'move', i, amount=i + 2)
+                self.assertEqual(len(log), 10)
+
+            records = eventlog.load_events(path)
+            self.assertEqual(records.dtype, eventlog.RECORD_DTYPE)
+            np.testing.assert_array_equal(records['turn'], np.arange(10))
+            np.testing.assert_array_equal(records['amount'], np.arange(2, 12))
+            self.assertTrue(
+                (records['event'] == eventlog.EVENT_CODE['move']).all())
+
+    def testReplayBalances(self):
+        """
+        The cash flows in the log add up to the final balance of each player,
+        and the last move of each player ends on its final location
+        """
+        log = eventlog.EventLog()
+        result = simulation.play_game(
+            self.lst_token, self.schema, seed=3, max_turns=300, log=log)
+        records = log.to_array()
+        code = eventlog.EVENT_CODE
+
+        self.assertTrue((records['game'] == 3).all())
+        self.assertTrue((np.diff(records['turn'].astype(int)) >= 0).all())
+
+        gameboard = board.Board(self.lst_token, self.schema, seed=3)
+        for i, token in enumerate(gameboard.players):
+            mine = records[records['player'] == i]
+            amount = mine['amount'].astype(int)
+            flows = {k: amount[mine['event'] == code[k]].sum() for k in code}
+            received = records['amount'][
+                (records['event'] == code['pay']) & (records['other'] == i)]
+
+            # Constructs are logged by number built
+            built = sum(
+                gameboard.lst_tile[idx].cost[eventlog.EVENTS[event]] * qty
+                for event, idx, qty in zip(
+                    mine['event'].tolist(), mine['tile'].tolist(),
+                    amount.tolist())
+                if eventlog.EVENTS[event] in ('house', 'hotel'))
+
+            balance = 1500 + flows['receive'] + received.sum() - \
+                flows['pay'] - flows['buy'] + flows['sell'] - built
+            self.assertEqual(balance, result.balances[token])
+
+    def testSimulatedTurnsNotLogged(self):
+        """
+        Turns played while a search agent is in a rollout are not recorded
+        """
+        log = eventlog.EventLog()
+        gameboard = board.Board(self.lst_token, self.schema, seed=0, log=log)
+        gameboard.in_rollout = True
+        for _ in range(20):
+            gameboard.play_next_turn()
+        self.assertEqual(len(log), 0)
+
+        gameboard.in_rollout = False
+        gameboard.play_next_turn()
+        self.assertGreater(len(log), 0)
+        self.assertTrue((log.to_array()['turn'] == 21).all())
+
+    def testSimulationLogDir(self):
+        """
+        Each chunk of a simulation writes its own log file
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            simulation.run_simulation(
+                4, self.lst_token, self.schema, seed=10, max_turns=50,
+                max_workers=2, chunksize=2, log_dir=tmp)
+
+            self.assertListEqual(
+                sorted(os.listdir(tmp)), ['events_10.bin', 'events_12.bin'])
+            records = eventlog.load_events(os.path.join(tmp, 'events_12.bin'))
+            self.assertSetEqual(set(records['game']), {12, 13})
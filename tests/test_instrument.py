@@ -0,0 +1,100 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+import board
+import instrument
+
+from common import DATADIR
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+        self.lst_token = ['apple','boot','car','dog']
+
+    def testPhases(self):
+        """
+        Every turn is counted and nested phases take part of the turn time
+        """
+        gameboard = board.Board(self.lst_token, self.schema, seed=1)
+        with instrument.profile(gameboard) as profiler:
+            for _ in range(100):
+                gameboard.play_next_turn()
+
+        summary = profiler.summary()
+        self.assertEqual(summary['turn']['calls'], 100)
+        self.assertGreater(summary['roll']['calls'], 0)
+        self.assertGreater(summary['decide']['calls'], 0)
+        self.assertLessEqual(summary['decide']['calls'], 100)
+        self.assertGreaterEqual(
+            summary['actions']['calls'], summary['decide']['calls'])
+        for phase in ('roll', 'actions', 'decide', 'execute'):
+            self.assertLess(summary[phase]['share'], 1)
+
+    def testTurnDrivers(self):
+        """
+        Turns are counted whether played out by play_next_turn, awaited or
+        driven through begin_turn and complete_turn
+        """
+        gameboard = board.Board(self.lst_token, self.schema, seed=1)
+        with instrument.profile(gameboard) as profiler:
+            for _ in range(20):
+                gameboard.play_next_turn()
+            for _ in range(20):
+                asyncio.run(gameboard.aplay_next_turn())
+            for _ in range(20):
+                player, tile, lst_optional = gameboard.begin_turn()
+                if lst_optional:
+                    gameboard.complete_turn(tile, player, lst_optional[0])
+
+        summary = profiler.summary()
+        self.assertEqual(summary['turn']['calls'], 60)
+        self.assertEqual(summary['begin']['calls'], 60)
+        self.assertGreater(summary['complete']['calls'], 0)
+        self.assertLessEqual(summary['complete']['calls'], 60)
+        self.assertLessEqual(
+            summary['begin']['share'] + summary['complete']['share'], 1)
+
+    def testDetached(self):
+        """
+        Detaching restores the plain methods, and the game plays out the same
+        """
+        one = board.Board(self.lst_token, self.schema, seed=2)
+        two = board.Board(self.lst_token, self.schema, seed=2)
+
+        with instrument.profile(one):
+            self.assertIn('begin_turn', vars(one))
+            for _ in range(50):
+                one.play_next_turn()
+        for _ in range(50):
+            two.play_next_turn()
+
+        self.assertNotIn('begin_turn', vars(one))
+        self.assertNotIn('cp_take_action', vars(one.players['apple']))
+        self.assertEqual(one.snapshot(), two.snapshot())
+
+    def testChromeTrace(self):
+        """
+        Traced calls are exported as complete events
+        """
+        gameboard = board.Board(self.lst_token, self.schema, seed=3)
+        with instrument.profile(gameboard, trace=True) as profiler:
+            for _ in range(10):
+                gameboard.play_next_turn()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.json')
+            profiler.write_chrome_trace(path)
+            with open(path, 'r') as f:
+                trace = json.load(f)
+
+        events = trace['traceEvents']
+        self.assertEqual(len(events), sum(profiler.counts.values()))
+        self.assertEqual(
+            len([e for e in events if e['name'] == 'turn']), 10)
+        self.assertTrue(all(e['ph'] == 'X' and e['dur'] >= 0 for e in events))
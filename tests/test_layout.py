@@ -0,0 +1,92 @@
+import json
+import os
+import pickle
+import unittest
+
+import board
+import layout
+
+from common import DATADIR
+
+
+class TestBoardLayout(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fpath = os.path.join(DATADIR, 'schema_monopoly_sg.json')
+        self.layout = layout.load_layout(self.fpath)
+
+    def testCompiledOnce(self):
+        """
+        A schema is compiled once per process
+        """
+        with open(self.fpath, 'r') as f:
+            schema = json.load(f)
+
+        self.assertIs(layout.load_layout(self.fpath), self.layout)
+        self.assertIs(
+            layout.compile_layout(schema), layout.compile_layout(schema))
+
+        # Copies of the schema, as unpickled by pool workers, share it too
+        self.assertIs(
+            layout.compile_layout(pickle.loads(pickle.dumps(schema))),
+            layout.compile_layout(schema))
+
+    def testLayoutIsImmutable(self):
+        """
+        Tile specs and tables cannot be modified
+        """
+        with self.assertRaises(TypeError):
+            self.layout.specs[1]['name'] = 'Changed'
+
+        with self.assertRaises(TypeError):
+            self.layout.groups['purple'] = ()
+
+        with self.assertRaises(TypeError):
+            self.layout.specs[1]['cost']['title'] = 1
+
+        with self.assertRaises(TypeError):
+            self.layout.specs[1]['schedule']['title'].update({'1': 0})
+
+    def testPicklable(self):
+        """
+        Layouts and the boards built from them can be pickled, e.g. to send
+        them to a process pool
+        """
+        clone = pickle.loads(pickle.dumps(self.layout))
+        self.assertEqual(clone, self.layout)
+        with self.assertRaises(TypeError):
+            clone.specs[1]['cost']['title'] = 1
+
+        gameboard = board.Board(['apple', 'boot'], schema=self.layout, seed=1)
+        for _ in range(10):
+            gameboard.play_next_turn()
+        clone = pickle.loads(pickle.dumps(gameboard))
+        self.assertEqual(clone.snapshot(), gameboard.snapshot())
+
+    def testTables(self):
+        """
+        Color groups, rent tables and nearest-tile tables are precomputed
+        """
+        self.assertTupleEqual(self.layout.groups['white'], (12, 28))
+        self.assertTupleEqual(self.layout.rents[5], (0, 500, 1000, 1500, 2000))
+        self.assertEqual(len(self.layout.purchasable), 28)
+
+        # Nearest utility and railroad strictly ahead, wrapping around GO
+        self.assertEqual(self.layout.nearest['white'][7], 12)
+        self.assertEqual(self.layout.nearest['white'][12], 28)
+        self.assertEqual(self.layout.nearest['white'][36], 12)
+        self.assertEqual(self.layout.nearest['black'][36], 5)
+
+    def testBoardFromLayout(self):
+        """
+        A board built from the layout matches one built from the schema
+        """
+        with open(self.fpath, 'r') as f:
+            schema = json.load(f)
+
+        one = board.Board(['apple', 'boot'], schema=schema, seed=1)
+        two = board.Board(['apple', 'boot'], schema=self.layout, seed=1)
+
+        self.assertListEqual(
+            [t.name for t in one.lst_tile], [t.name for t in two.lst_tile])
+        self.assertDictEqual(one.colorgrp, two.colorgrp)
+        self.assertEqual(one.snapshot(), two.snapshot())
@@ -0,0 +1,78 @@
+import copy
+import json
+import os
+import unittest
+
+import numpy as np
+
+import markov
+import vectorized
+
+from common import DATADIR
+
+
+class TestStationaryDistribution(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+    def testTransitionRowsSumToOne(self):
+        """
+        Every state transitions somewhere
+        """
+        matrix = markov.transition_matrix(self.schema)
+
+        np.testing.assert_allclose(matrix.sum(axis=1), 1.)
+
+    def testDistribution(self):
+        """
+        Probabilities sum up to 1, nobody ends a turn on Go To Jail and Jail is
+        the most visited tile
+        """
+        pi = markov.stationary_distribution(self.schema)
+
+        self.assertEqual(len(pi), 40)
+        self.assertAlmostEqual(sum(pi), 1.)
+        self.assertEqual(pi[30], 0.)
+        self.assertEqual(max(pi), pi[10])
+
+    def testCardMovesChain(self):
+        """
+        Go Back Three from the last Chance tile lands on Community Chest,
+        which is drawn from in turn
+        """
+        layout = markov.compile_layout(self.schema)
+        decks = {
+            'chance': markov._load_deck('schema_chance.json'),
+            'community': markov._load_deck('schema_chest.json')
+        }
+
+        landing = markov._land(36, layout, decks)
+
+        # Advance to GO and Go To Jail move the player off the chest tile
+        self.assertAlmostEqual(landing[33], 1 / 16 * 14 / 16)
+        self.assertAlmostEqual(sum(landing.values()), 1.)
+
+    def testDistributionIsCached(self):
+        """
+        The distribution is solved once per schema
+        """
+        one = markov.stationary_distribution(self.schema)
+        two = markov.stationary_distribution(copy.deepcopy(self.schema))
+
+        self.assertIs(one, two)
+
+    def testMatchesSimulation(self):
+        """
+        Without card decks, the distribution agrees with simulated landings
+        """
+        schema = copy.deepcopy(self.schema)
+        for tile in schema['board-sg'].values():
+            if tile['name'] in ('Chance', 'Community Chest'):
+                tile['name'] = 'Free Parking'
+
+        pi = np.array(markov.stationary_distribution(schema))
+        mover = vectorized.BatchMover(5000, 1, seed=0)
+        landings = mover.run(200)
+
+        np.testing.assert_allclose(pi, landings / landings.sum(), atol=2e-3)
@@ -0,0 +1,74 @@
+import json
+import os
+import unittest
+
+import board
+
+from common import DATADIR
+from ownership import OwnershipIndex
+
+
+class TestOwnershipIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+        self.lst_token = ['apple','boot','car','dog']
+        self.new_board = board.Board(self.lst_token, self.schema, seed=0)
+
+    def testGroupChecks(self):
+        """
+        Counts, monopolies and building rights follow the tiles bought and
+        sold
+        """
+        gameboard = self.new_board
+        index = gameboard.ownership
+        apple = gameboard.players['apple']
+        purple = gameboard.layout.groups['purple']
+
+        gameboard.player_buy(gameboard.lst_tile[purple[0]], apple)
+        self.assertEqual(index.count('purple', 'apple'), 1)
+        self.assertEqual(index.count_at(purple[1], 'apple'), 1)
+        self.assertFalse(index.owns_group('apple', 'purple'))
+        self.assertFalse(index.can_build('apple', purple[0]))
+
+        for idx in purple[1:]:
+            gameboard.player_buy(gameboard.lst_tile[idx], apple)
+        self.assertTrue(index.owns_group('apple', 'purple'))
+        self.assertTrue(index.can_build('apple', purple[0]))
+        self.assertFalse(index.can_build('boot', purple[0]))
+        self.assertEqual(index.owner(purple[0]), 'apple')
+        self.assertEqual(gameboard.colorgrp['purple']['apple'], len(purple))
+
+        gameboard.player_sell(gameboard.lst_tile[purple[0]], apple)
+        self.assertFalse(index.owns_group('apple', 'purple'))
+        self.assertIsNone(index.owner(purple[0]))
+        self.assertEqual(index.count('purple', None), 0)
+
+    def testRailroadsAreNotBuildable(self):
+        """
+        Holding every railroad is a monopoly, but not one that can be built on
+        """
+        gameboard = self.new_board
+        apple = gameboard.players['apple']
+        black = gameboard.layout.groups['black']
+        for idx in black:
+            gameboard.player_buy(gameboard.lst_tile[idx], apple)
+
+        self.assertTrue(gameboard.ownership.owns_group('apple', 'black'))
+        self.assertFalse(gameboard.ownership.can_build('apple', black[0]))
+
+    def testConsistentWithTileOwners(self):
+        """
+        The index agrees with the owner of every tile through a game
+        """
+        gameboard = self.new_board
+        for _ in range(200):
+            if gameboard.is_over:
+                break
+            gameboard.play_next_turn()
+
+            for idx in gameboard.layout.purchasable:
+                self.assertEqual(
+                    gameboard.ownership.owner(idx),
+                    gameboard.lst_tile[idx].owner)
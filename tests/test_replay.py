@@ -0,0 +1,95 @@
+import json
+import os
+import unittest
+
+import board
+import eventlog
+import replay
+
+from common import DATADIR
+
+
+class TestGameReplay(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+        self.lst_token = ['apple','boot','car','dog']
+
+        # Record a game in which one of the players searches for its moves,
+        # keeping a snapshot of the board after every turn
+        self.log = eventlog.EventLog()
+        gameboard = board.Board(
+            self.lst_token, self.schema, seed=5, log=self.log, agents={
+                'boot': ('mcts', {'iterations': 4, 'rollout_depth': 5})})
+        self.log.game = 5
+        self.snapshots = [gameboard.snapshot()]
+        while not gameboard.is_over and gameboard.nturn < 150:
+            gameboard.play_next_turn()
+            self.snapshots.append(gameboard.snapshot())
+
+    def assertSameState(self, one, two):
+        """
+        Compare the board columns of two snapshots
+        """
+        for k in ('owner', 'house', 'hotel', 'position', 'nround', 'balance',
+                'jail', 'bankrupt', 'jail_free', 'assets', 'decks', 'turn',
+                'nturn'):
+            self.assertEqual(getattr(one, k), getattr(two, k), k)
+
+    def testReplayMatchesGame(self):
+        """
+        Replaying the log reproduces the board after every turn
+        """
+        game = replay.GameReplay(
+            self.lst_token, self.schema, self.log.to_array(),
+            keyframe_interval=20)
+        self.assertEqual(game.board.nturn, 0)
+
+        for turn, snapshot in enumerate(self.snapshots):
+            self.assertSameState(game.seek(turn).snapshot(), snapshot)
+
+        self.assertListEqual(
+            sorted(game.keyframes), list(range(0, len(self.snapshots), 20)))
+
+    def testFullGames(self):
+        """
+        Whole games replay to the end, including builds on tiles already at
+        capacity
+        """
+        for seed in (14, 20, 30):
+            log = eventlog.EventLog()
+            log.game = seed
+            gameboard = board.Board(
+                self.lst_token, self.schema, seed=seed, log=log)
+            while not gameboard.is_over and gameboard.nturn < 1000:
+                gameboard.play_next_turn()
+
+            game = replay.GameReplay(self.lst_token, self.schema, log.to_array())
+            self.assertSameState(
+                game.seek(gameboard.nturn).snapshot(), gameboard.snapshot())
+
+    def testSeedMismatch(self):
+        """
+        A log whose game id is not the seed of the game fails on the first
+        turn that differs
+        """
+        records = self.log.to_array().copy()
+        records['game'] = 6
+        game = replay.GameReplay(self.lst_token, self.schema, records)
+        with self.assertRaisesRegex(replay.ReplayDivergence, '^Turn 1 '):
+            game.seek(len(self.snapshots) - 1)
+
+    def testSeekBackwards(self):
+        """
+        Seeking back restores the nearest keyframe and plays forward from it
+        """
+        game = replay.GameReplay(
+            self.lst_token, self.schema, self.log.to_array(),
+            keyframe_interval=20)
+        last = len(self.snapshots) - 1
+
+        for turn in (last, 45, 3, last, 40, 41, 40):
+            self.assertSameState(
+                game.seek(turn).snapshot(), self.snapshots[turn])
+        self.assertTrue((game.events(41)['turn'] == 41).all())
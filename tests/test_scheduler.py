@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import unittest
+
+import numpy as np
+
+import scheduler
+import simulation
+import tile
+
+from agent import batch_agent
+from agent.default_agent import NaiveAgent
+from agent.metaclass import AbstractAsyncAgent
+
+from common import DATADIR
+
+
+class SlowAgent(NaiveAgent):
+    """
+    Default strategy taking a while to decide, without holding the GIL.
+    Counts the decisions in progress at once across all instances
+    """
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.in_flight = cls.max_in_flight = 0
+
+    def cp_take_action(self, lst_action):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            time.sleep(0.005)
+            return super().cp_take_action(lst_action)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+        self.lst_token = ['apple','boot','car','dog']
+
+    def testAsyncGameMatchesSync(self):
+        """
+        Awaiting the decisions plays out the same game
+        """
+        result = asyncio.run(scheduler.play_game_async(
+            self.lst_token, self.schema, seed=7, max_turns=300))
+        expected = simulation.play_game(
+            self.lst_token, self.schema, seed=7, max_turns=300)
+
+        self.assertEqual(result, expected)
+
+    def testAgentsAreAwaitable(self):
+        """
+        Agents implement the awaitable interface by default
+        """
+        summary = scheduler.play_games_concurrently(
+            self.lst_token, self.schema, range(4), max_turns=20)
+
+        self.assertEqual(summary.games, 4)
+        self.assertIsInstance(SlowAgent(agent=SlowAgent, token='apple'),
+            AbstractAsyncAgent)
+
+    def testSlowAgentsInterleave(self):
+        """
+        Games go on while slow agents decide in the thread pool
+        """
+        seeds = range(16)
+        agents = {'apple': SlowAgent}
+
+        SlowAgent.reset()
+        summary = scheduler.play_games_concurrently(
+            self.lst_token, self.schema, seeds, max_turns=24, agents=agents,
+            max_threads=16)
+        concurrent = SlowAgent.max_in_flight
+
+        SlowAgent.reset()
+        serial = simulation.SimulationSummary()
+        for seed in seeds:
+            serial.add(asyncio.run(scheduler.play_game_async(
+                self.lst_token, self.schema, seed, 24,
+                agents={'apple': SlowAgent})))
+
+        self.assertEqual(summary.wins, serial.wins)
+        self.assertEqual(summary.balances, serial.balances)
+        # Decisions of different games overlap, unlike one game at a time
+        self.assertGreater(concurrent, 1)
+        self.assertEqual(SlowAgent.max_in_flight, 1)
+
+    def testAsyncSimulation(self):
+        """
+        The process pool of event loops gives the same results as the
+        synchronous simulation
+        """
+        summary = scheduler.run_async_simulation(
+            8, self.lst_token, self.schema, seed=30, max_turns=100,
+            max_workers=2, chunksize=4)
+        expected = simulation.run_simulation(
+            8, self.lst_token, self.schema, seed=30, max_turns=100,
+            max_workers=2, chunksize=4)
+
+        self.assertEqual(summary.turns, expected.turns)
+        self.assertEqual(summary.wins, expected.wins)
+
+
+class TestBatchDecisions(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+        self.lst_token = ['apple','boot','car','dog']
+
+        # Buy first, then build, as the default strategy does
+        self.weights = np.zeros(
+            (len(batch_agent.ACTION_KINDS),
+             len(batch_agent.DECISION_FEATURES)), dtype=np.float32)
+        self.weights[batch_agent.KIND_INDEX['acquire'], 0] = 2.
+        self.weights[batch_agent.KIND_INDEX['add_construct'], 0] = 1.
+
+    def testLinearScoring(self):
+        """
+        Actions are scored against the features of their own decision, and
+        padding never wins
+        """
+        Action = tile.Action
+        agent = batch_agent.LinearBatchAgent(self.weights)
+        lst_decisions = [
+            [Action(None, {}), Action('acquire', {})],
+            [Action(None, {})],
+            [Action(None, {}), Action('liquidate_title', {}),
+             Action('add_construct', {'type': 'house', 'amt': 1})]]
+        features = np.ones((3, len(batch_agent.DECISION_FEATURES)))
+        features[0, 0] = -1.
+
+        self.assertListEqual(
+            list(agent.cp_take_actions(lst_decisions, features)), [0, 0, 2])
+
+    def testBatchedGamesMatchDefault(self):
+        """
+        A batch agent playing the default strategy for every player plays out
+        the same games as the default agents
+        """
+        seeds = range(12)
+        summary = scheduler.play_games_batched(
+            self.lst_token, self.schema, seeds,
+            batch_agent.LinearBatchAgent(self.weights), self.lst_token,
+            max_turns=200)
+
+        expected = simulation.play_games(
+            self.lst_token, self.schema, seeds, max_turns=200)
+        self.assertEqual(summary.turns, expected.turns)
+        self.assertEqual(summary.wins, expected.wins)
+        self.assertEqual(summary.balances, expected.balances)
+        self.assertEqual(summary.landings, expected.landings)
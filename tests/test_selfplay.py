@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import selfplay
+import simulation
+
+from actionspace import get_action_space
+from common import DATADIR
+from encoder import BoardEncoder
+from agent.default_agent import NaiveAgent
+from layout import compile_layout
+
+
+class CrashingAgent(NaiveAgent):
+    """
+    Kills the process on its first decision
+    """
+    def cp_take_action(self, lst_action):
+        os._exit(3)
+
+
+class TestSelfPlay(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+        self.lst_token = ['apple','boot','car','dog']
+        self.encoder = BoardEncoder(compile_layout(self.schema))
+
+    def testGameRecords(self):
+        """
+        Every decision is recorded with a legal action, and the winner of
+        the game has an outcome of 1 on all of its decisions
+        """
+        records = selfplay.selfplay_game(
+            self.lst_token, self.schema, 7, self.encoder, max_turns=300)
+        result = simulation.play_game(
+            self.lst_token, self.schema, seed=7, max_turns=300)
+
+        self.assertGreater(len(records), 0)
+        self.assertEqual(
+            records['legal'].shape[1],
+            len(get_action_space(self.encoder.layout)))
+        self.assertTrue(
+            records['legal'][np.arange(len(records)), records['action']].all())
+        self.assertTrue((np.diff(records['turn'].astype(int)) > 0).all())
+
+        winner = self.lst_token.index(result.winner)
+        np.testing.assert_array_equal(
+            records['outcome'], records['player'] == winner)
+        # Positions are one-hot from the point of view of the player
+        position = records['state'][:, self.encoder.sections['position']]
+        self.assertTrue((position.sum(axis=1) == 4).all())
+
+    def testShardRotation(self):
+        """
+        Records are split into shards of bounded size
+        """
+        dtype = selfplay.record_dtype(self.encoder)
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = selfplay.ShardWriter(tmp, dtype, shard_size=10)
+            for n in (4, 13, 0, 6):
+                records = np.zeros(n, dtype=dtype)
+                records['turn'] = np.arange(n)
+                writer.write(records)
+            writer.close()
+
+            shards = selfplay.load_shards(tmp)
+            self.assertListEqual([len(s) for s in shards], [10, 10, 3])
+            self.assertListEqual(
+                list(np.concatenate(shards)['turn']),
+                list(range(4)) + list(range(13)) + list(range(6)))
+
+    def testParallelSelfPlay(self):
+        """
+        Workers play the games in parallel and the writer collects all of
+        their decisions
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = selfplay.run_selfplay(
+                6, self.lst_token, self.schema, tmp, seed=20, max_turns=100,
+                max_workers=2, shard_size=200)
+            records = np.concatenate(selfplay.load_shards(tmp))
+
+            self.assertEqual(len(paths), -(-len(records) // 200))
+
+        expected = sum(
+            len(selfplay.selfplay_game(
+                self.lst_token, self.schema, seed, self.encoder, 100))
+            for seed in range(20, 26))
+        self.assertEqual(len(records), expected)
+        self.assertSetEqual(set(records['game']), set(range(20, 26)))
+
+    def testWorkerDied(self):
+        """
+        The writer raises instead of waiting forever when a worker dies
+        without reporting an error
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(RuntimeError):
+                selfplay.run_selfplay(
+                    2, self.lst_token, self.schema, tmp, max_turns=100,
+                    agents={'apple': CrashingAgent}, max_workers=2,
+                    poll_interval=0.05)
+
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+import time
+import unittest
+
+import server
+import simulation
+
+from common import DATADIR
+
+
+def buy_policy(message: dict) -> int:
+    """
+    Buy or build whenever offered
+    """
+    for i, (action, _) in enumerate(message['actions']):
+        if action in ('acquire', 'add_construct'):
+            return i
+
+    return 0
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+        self.lst_token = ['apple','boot','car','dog']
+
+    async def testRemoteGameMatchesLocal(self):
+        """
+        A remote client playing the default strategy plays out the same game
+        as the server-side agent
+        """
+        async with server.GameServer(self.schema) as game_server:
+            end = await server.play_remote(
+                '127.0.0.1', game_server.port, self.lst_token, ['apple'],
+                buy_policy, seed=7, max_turns=300)
+
+        result = simulation.play_game(
+            self.lst_token, self.schema, seed=7, max_turns=300)
+        self.assertEqual(end['type'], 'end')
+        self.assertEqual(end['turns'], result.turns)
+        self.assertDictEqual(end['balances'], result.balances)
+
+    async def testConcurrentSessions(self):
+        """
+        Many sessions share the event loop, limited to max_sessions at once
+        """
+        async with server.GameServer(
+                self.schema, max_sessions=8) as game_server:
+            ends = await asyncio.gather(*[
+                server.play_remote(
+                    '127.0.0.1', game_server.port, self.lst_token,
+                    self.lst_token[:2], buy_policy, seed=i, max_turns=100)
+                for i in range(24)])
+
+        self.assertEqual(game_server.sessions, 24)
+        self.assertEqual(game_server.active, 0)
+        self.assertTrue(all(end['type'] == 'end' for end in ends))
+
+    async def testMoveTimeout(self):
+        """
+        A client too slow to answer has its move played as do nothing, and
+        its late answers are ignored
+        """
+        game_server = server.GameServer(self.schema, move_timeout=0.001)
+
+        async def slow_policy(message):
+            # Answer only once the server gave up on the move
+            timeouts = game_server.timeouts
+            while game_server.timeouts == timeouts:
+                await asyncio.sleep(0)
+            return buy_policy(message)
+
+        async with game_server:
+            end = await server.play_remote(
+                '127.0.0.1', game_server.port, self.lst_token, ['apple'],
+                slow_policy, seed=7, max_turns=40)
+
+        self.assertEqual(end['type'], 'end')
+        self.assertGreater(game_server.timeouts, 0)
+        self.assertEqual(game_server.invalid, 0)
+
+    async def testInvalidIndex(self):
+        """
+        An answer outside the actions offered, negative or not an integer,
+        is played as do nothing
+        """
+        chosen = []
+
+        class RecordingServer(server.GameServer):
+            async def remote_action(self, *args):
+                action = await super().remote_action(*args)
+                chosen.append(action)
+                return action
+
+        answers = iter([-1, 'x', 99, 1.0] * 100)
+        async with RecordingServer(self.schema) as game_server:
+            end = await server.play_remote(
+                '127.0.0.1', game_server.port, self.lst_token, ['apple'],
+                lambda message: next(answers), seed=7, max_turns=100)
+
+        self.assertEqual(end['type'], 'end')
+        self.assertGreater(len(chosen), 0)
+        self.assertEqual(game_server.invalid, len(chosen))
+        self.assertTrue(all(action.action is None for action in chosen))
+
+    async def testJoinValidated(self):
+        """
+        A join without tokens or with the same token twice gets an error
+        """
+        async with server.GameServer(self.schema) as game_server:
+            for tokens in ([], ['apple', 'apple']):
+                end = await server.play_remote(
+                    '127.0.0.1', game_server.port, tokens, [], buy_policy)
+                self.assertEqual(end['type'], 'error')
+
+    async def testStaleAnswersKeepDeadline(self):
+        """
+        Answers to earlier turns do not give the client more time to answer
+        the current one
+        """
+        game_server = server.GameServer(self.schema, move_timeout=0.2)
+        async with game_server:
+            reader, writer = await asyncio.open_connection(
+                '127.0.0.1', game_server.port)
+            writer.write(server.encode({
+                'type': 'join', 'tokens': self.lst_token,
+                'remote': self.lst_token, 'seed': 7}))
+            message = json.loads(await reader.readline())
+            self.assertEqual(message['type'], 'decide')
+
+            # Keep sending stale answers until the server moves on
+            start = time.perf_counter()
+            line = asyncio.ensure_future(reader.readline())
+            while not line.done() and time.perf_counter() - start < 2.:
+                writer.write(server.encode({
+                    'type': 'action', 'turn': -1, 'index': 0}))
+                await asyncio.sleep(0.02)
+            elapsed = time.perf_counter() - start
+            writer.close()
+            await line
+
+        self.assertEqual(game_server.timeouts, 1)
+        self.assertLess(elapsed, 1.)
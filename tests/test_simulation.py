@@ -0,0 +1,50 @@
+import json
+import os
+import unittest
+
+import simulation
+
+from common import DATADIR
+
+
+class TestSimulation(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+        self.lst_token = ['apple','boot','car','dog']
+
+    def testGameRunsToCompletion(self):
+        """
+        A game ends with a bankruptcy or at the turn cap
+        """
+        result = simulation.play_game(
+            self.lst_token, self.schema, seed=7, max_turns=500)
+
+        self.assertLessEqual(result.turns, 500)
+        self.assertEqual(sum(result.landings.values()), result.turns)
+        self.assertSetEqual(set(result.balances), set(self.lst_token))
+
+    def testSeededGameIsReproducible(self):
+        """
+        The same seed always plays out the same game
+        """
+        one = simulation.play_game(self.lst_token, self.schema, seed=11)
+        two = simulation.play_game(self.lst_token, self.schema, seed=11)
+
+        self.assertEqual(one, two)
+
+    def testBatchMatchesSerialRun(self):
+        """
+        Results merged from the process pool are the same as a serial run
+        """
+        summary = simulation.run_simulation(
+            20, self.lst_token, self.schema, seed=100, max_turns=300,
+            max_workers=2, chunksize=6)
+        serial = simulation.play_games(
+            self.lst_token, self.schema, range(100, 120), max_turns=300)
+
+        self.assertEqual(summary.games, 20)
+        self.assertEqual(summary.turns, serial.turns)
+        self.assertEqual(summary.wins, serial.wins)
+        self.assertEqual(summary.landings, serial.landings)
@@ -0,0 +1,63 @@
+import json
+import os
+import unittest
+
+import board
+import state
+
+from board import allocate_sequence_ownership
+from common import DATADIR
+
+
+class TestBoardState(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+        self.lst_token = ['apple','boot','car','dog']
+        self.new_board = board.Board(self.lst_token, schema=self.schema)
+
+    def testTilesHaveNoInstanceDict(self):
+        """
+        Tiles are slotted
+        """
+        for tile in self.new_board.lst_tile:
+            self.assertFalse(hasattr(tile, '__dict__'), tile.name)
+
+    def testRoundTrip(self):
+        """
+        Applying a captured state undoes later changes to the board
+        """
+        gameboard = allocate_sequence_ownership(self.new_board)
+        apple = gameboard.players['apple']
+        gameboard.player_construct(
+            gameboard.lst_tile[24], apple, type='house', amt=2)
+        gameboard.move_by_steps(apple, 7)
+
+        snapshot = state.BoardState.from_board(gameboard)
+        owners = [getattr(t, 'owner', None) for t in gameboard.lst_tile]
+        colorgrp = {k: dict(v) for k, v in gameboard.colorgrp.items()}
+        terrain = gameboard.calculate_terrain_value(apple)
+
+        gameboard.player_sell(gameboard.lst_tile[24], apple)
+        gameboard.player_buy(gameboard.lst_tile[24], gameboard.players['dog'])
+        gameboard.lst_tile[24].liquidate_constructs()
+        gameboard.move_by_steps(apple, 5)
+        snapshot.apply(gameboard)
+
+        self.assertListEqual(
+            [getattr(t, 'owner', None) for t in gameboard.lst_tile], owners)
+        self.assertDictEqual(gameboard.colorgrp, colorgrp)
+        self.assertEqual(gameboard.lst_tile[24].house, 2)
+        self.assertEqual(gameboard.player_location['apple'], 7)
+        self.assertEqual(apple.balance, 1300)
+        self.assertIn(gameboard.lst_tile[24], apple.assets['red'])
+        self.assertEqual(gameboard.calculate_terrain_value(apple), terrain)
+
+    def testCompactSize(self):
+        """
+        The state of a 4-player board fits in a few hundred bytes
+        """
+        snapshot = state.BoardState.from_board(self.new_board)
+
+        self.assertLess(snapshot.nbytes, 256)
@@ -1,3 +1,4 @@
+import random
 import unittest
 
 import tile
@@ -18,4 +19,36 @@ class TestTileChance(TestTileEvent, unittest.TestCase):
 
 class TestTileCommunityChest(TestTileEvent, unittest.TestCase):
     def setUp(self):
-        self.tile = tile.TileCommunityChest()
\ No newline at end of file
+        self.tile = tile.TileCommunityChest()
+
+class TestDeckCycling(unittest.TestCase):
+    def testCardsCycleInOrder(self):
+        """
+        Every card is drawn once before the deck wraps around in the same
+        order
+        """
+        deck = tile.TileChance(rng=random.Random(0))
+        drawn = [deck.get_action()[1].params['card']['name']
+            for _ in range(32)]
+
+        self.assertEqual(len(set(drawn[:16])), 16)
+        self.assertListEqual(drawn[:16], drawn[16:])
+
+    def testReshuffleOnExhaust(self):
+        """
+        A reshuffling deck starts a new order after the last card
+        """
+        deck = tile.TileChance(rng=random.Random(0), reshuffle=True)
+        first = list(deck.deck)
+        for _ in range(16):
+            deck.get_action()
+
+        self.assertEqual(deck.top, 0)
+        self.assertNotEqual(deck.deck, first)
+        self.assertSetEqual(set(deck.deck), set(first))
+
+    def testSchemaIsShared(self):
+        """
+        The card schema is parsed once and shared by every deck
+        """
+        self.assertIs(tile.TileChance().schema, tile.TileChance().schema)
@@ -0,0 +1,107 @@
+import json
+import os
+import unittest
+
+import board
+import tournament
+
+from agent.default_agent import NaiveAgent
+from common import DATADIR
+
+
+class PassiveAgent(NaiveAgent):
+    """
+    Never buys nor builds
+    """
+    def cp_take_action(self, lst_action):
+        return lst_action[0]
+
+
+class RecklessAgent(NaiveAgent):
+    """
+    Buys and builds as the default strategy, but never sells to cover a
+    shortfall
+    """
+    def cp_asset_sale(self, amt):
+        return []
+
+
+class TestTournament(unittest.TestCase):
+    def setUp(self) -> None:
+        with open(os.path.join(DATADIR, 'schema_monopoly_sg.json'), 'r') as f:
+            self.schema = json.load(f)
+
+    def testBradleyTerry(self):
+        """
+        An even pairing rates both agents the same, and a lopsided one rates
+        the winner higher
+        """
+        Pairing = tournament.Pairing
+        fit = tournament.bradley_terry(
+            ['a', 'b', 'c'],
+            [Pairing('a', 'b', 40, 20., False),
+             Pairing('a', 'c', 40, 36., True),
+             Pairing('b', 'c', 40, 36., True)])
+
+        self.assertAlmostEqual(fit['a'][0], fit['b'][0])
+        self.assertGreater(fit['a'][0], fit['c'][0])
+        self.assertGreater(fit['a'][1], 0)
+
+    def testAlphaSpending(self):
+        """
+        The tests of a pairing spend 1 - confidence in total, so that a
+        score decided by a single test at the confidence level is not
+        decided when tested after every batch
+        """
+        tour = tournament.Tournament(
+            {'a': NaiveAgent, 'b': NaiveAgent}, self.schema,
+            min_games=20, max_games=400, batch_size=20)
+        looks = range(20, 401, 20)
+        spent = sum(
+            tour.alpha_spent(games) - tour.alpha_spent(games - 20)
+            for games in looks[1:]) + tour.alpha_spent(20)
+        self.assertAlmostEqual(spent, 1 - tour.confidence)
+
+        # 63.5 out of 100 is 2.8 standard errors away from a draw, beyond
+        # the 2.58 of a single test at 99%
+        self.assertFalse(tour.is_decided(100, 63.5, 80))
+        self.assertTrue(tour.is_decided(100, 68., 80))
+        self.assertFalse(tour.is_decided(10, 10.))
+
+    def testFirstMoveAlternates(self):
+        """
+        Agent one moves first in even games and agent two in odd games
+        """
+        for seed in range(6):
+            lst_token, agents = tournament.seating('one', 'two', seed, 4)
+            gameboard = board.Board(
+                lst_token, self.schema, seed=seed, turn_order=lst_token)
+
+            first = gameboard.next_player().token
+            self.assertEqual(
+                agents[first], 'one' if seed % 2 == 0 else 'two')
+            self.assertEqual(
+                gameboard.next_player().token, lst_token[1])
+
+    def testEarlyStopping(self):
+        """
+        A clear gap is decided well before the game cap, and the agent ahead
+        in the pairing gets the higher rating
+        """
+        tour = tournament.Tournament(
+            {'passive': PassiveAgent, 'reckless': RecklessAgent},
+            self.schema, min_games=10, max_games=200, batch_size=10,
+            max_turns=300, max_workers=2)
+        ratings = tour.run()
+
+        pairing = tour.pairings[('passive', 'reckless')]
+        self.assertTrue(pairing.decided)
+        self.assertLess(pairing.games, 200)
+        self.assertEqual(ratings['passive'].games, pairing.games)
+
+        ahead, behind = ('passive', 'reckless') \
+            if pairing.score > pairing.games / 2 else ('reckless', 'passive')
+        self.assertGreater(ratings[ahead].elo, ratings[behind].elo)
+        self.assertLess(ratings[ahead].low, ratings[ahead].elo)
+        self.assertAlmostEqual(
+            ratings['passive'].elo + ratings['reckless'].elo, 3000)
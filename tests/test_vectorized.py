@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+import vectorized
+
+
+class TestBatchMover(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mover = vectorized.BatchMover(500, 4, seed=3)
+
+    def testRollRange(self):
+        """
+        A roll moves between 3 and 36 steps with two six-sided dice
+        """
+        steps, to_jail = self.mover.roll()
+        moved = steps[~to_jail]
+
+        self.assertGreaterEqual(moved.min(), 3)
+        self.assertLessEqual(moved.max(), 36)
+
+    def testPositionsStayOnBoard(self):
+        """
+        Positions wrap around the board and the Go To Jail tile is never the
+        final position of a turn
+        """
+        landings = self.mover.run(50)
+
+        self.assertTrue(((self.mover.position >= 0) &
+            (self.mover.position < 40)).all())
+        self.assertEqual(landings[30], 0)
+        self.assertEqual(landings.sum(), 500 * 50)
+
+    def testJailedPlayersAreOnJailTile(self):
+        """
+        Every jailed player stands on the Jail tile
+        """
+        self.mover.run(50)
+
+        self.assertTrue((self.mover.position[self.mover.jail] == 10).all())
+
+    def testSeedIsReproducible(self):
+        """
+        The same seed plays out the same moves
+        """
+        other = vectorized.BatchMover(500, 4, seed=3)
+        self.mover.run(20)
+        other.run(20)
+
+        np.testing.assert_array_equal(self.mover.position, other.position)
+        np.testing.assert_array_equal(self.mover.nround, other.nround)
@@ -10,12 +10,38 @@ from collections import namedtuple
 
 Action = namedtuple('Action', ['action', 'params'])
 
+# Parsed card schemas, shared by the decks of every board. Keyed by file path
+_CARD_SCHEMA_CACHE = {}
+
+
+def load_card_schema(fpath: str) -> dict:
+    """
+    Load a Chance/ Community Chest schema from json file, once per process.
+    The schema is shared and must not be modified
+    """
+    if fpath not in _CARD_SCHEMA_CACHE:
+        with open(fpath, 'r') as f:
+            _CARD_SCHEMA_CACHE[fpath] = json.load(f)
+
+    return _CARD_SCHEMA_CACHE[fpath]
+
+
+def rent_table(schedule: dict) -> tuple:
+    """
+    Convert the title schedule keyed by the number of tiles owned into a
+    tuple indexed by the same number
+    """
+    n = max([int(k) for k in schedule] + [0])
+    return tuple(schedule.get(str(i), 0) for i in range(n + 1))
+
 
 class Tile(metaclass=abc.ABCMeta):
+    __slots__ = ('owner',)
+
     def __init__(self):
         self.owner = None
 
-    def get_action(self) -> list:
+    def get_action(self, visitor: Optional[str]=None) -> list:
         """
         All available actions to this player
         """
@@ -28,9 +54,9 @@ class Tile(metaclass=abc.ABCMeta):
         if not self.owner or token == self.owner:
             return 0
 
-        return self.get_charges(str(ntile))
+        return self.get_charges(ntile)
 
-    def get_charges(self, ntile: Optional[str]='0') -> int:
+    def get_charges(self, ntile: Optional[int]=0) -> int:
         """
         Standard method for the Tile class. Returns 0
         """
@@ -40,6 +66,8 @@ class TilePurchasable(Tile):
     """
     Metaclass for properties, infra and utils
     """
+    __slots__ = ()
+
     @abc.abstractmethod
     def liquidate_title(self):
         raise NotImplementedError
@@ -56,32 +84,41 @@ class TilePurchasable(Tile):
 
         action_purchasable = []
         if self.owner and visitor != self.owner:
-            action_purchasable = [
-                tuple(['pay', {'payer': visitor, 'payee': self.owner}])]
+            action_purchasable = [Action('pay', {'payee': self.owner})]
         elif not self.owner:
-            action_purchasable = [
-                tuple(['acquire', {'tile': self.name}])]
+            action_purchasable = [Action('acquire', {})]
         else:
-            action_purchasable = [
-                Action('liquidate_title', {'tile': self.name})]
+            action_purchasable = [Action('liquidate_title', {})]
 
         return actions + action_purchasable
 
 class TileProperty(TilePurchasable):
+    __slots__ = (
+        'name', 'idx', 'color', 'cost', 'schedule_fee', 'rent', 'house',
+        'hotel')
+
     def __init__(self, schema: dict):
         self.name = schema['name']
         self.idx = schema['idx']
         self.color = schema['color']
         self.cost = schema['cost']
         self.schedule_fee = schema['schedule']
+        self.rent = schema['rent'] if 'rent' in schema \
+            else rent_table(self.schedule_fee['title'])
 
-        self.construct_count = {
-            'house': 0,
-            'hotel': 0
-        }
+        # Number of constructs on this tile
+        self.house = 0
+        self.hotel = 0
 
         self.owner = None
 
+    @property
+    def construct_count(self) -> dict:
+        """
+        Number of houses and hotels on this tile
+        """
+        return {'house': self.house, 'hotel': self.hotel}
+
     def get_action(self, visitor: str) -> list:
         """
         Return a list of valid actions for the visitor
@@ -89,20 +126,19 @@ class TileProperty(TilePurchasable):
         actions = super().get_action(visitor)
         if actions[1].action == 'liquidate_title':
             # Maximum of 1 hotel and 4 houses
-            if self.construct_count['house'] < 4:
-                for i in range(1, self.construct_count['house'] + 1):
+            if self.house < 4:
+                for i in range(1, self.house + 1):
                     actions += [
                         Action('sell_construct', {'type': 'house', 'amt': i})]
 
-                for i in range(1, 5 - self.construct_count['house']):
+                for i in range(1, 5 - self.house):
                     actions += [
                         Action('add_construct', {'type': 'house', 'amt': i})]
 
-            if self.construct_count['house'] == 4 and \
-                not self.construct_count['hotel']:
+            if self.house == 4 and not self.hotel:
                 actions += [
                     Action('add_construct', {'type': 'hotel', 'amt': 1})]
-            elif self.construct_count['hotel']:
+            elif self.hotel:
                 actions += [
                     Action('sell_construct', {'type': 'hotel', 'amt': 1})]
 
@@ -112,16 +148,15 @@ class TileProperty(TilePurchasable):
         """
         Sell the constructed buildings. Returns the proceeds from the sale
         """
-        constructs = sum([v for k, v in self.construct_count.items()])
-        if not constructs:
+        if not self.house + self.hotel:
             raise Exception('No more constructs on this tile')
 
         # Constructs can only be sold in sequence: hotels -> house
-        if self.construct_count['hotel']:
-            self.construct_count['hotel'] -= 1
+        if self.hotel:
+            self.hotel -= 1
             return self.cost['hotel']
 
-        self.construct_count['house'] -= 1
+        self.house -= 1
         return self.cost['house']
 
     def liquidate_title(self) -> int:
@@ -140,18 +175,18 @@ class TileProperty(TilePurchasable):
         self.owner = name
         return self.cost['title']
 
-    def get_charges(self, ntile: str) -> int:
+    def get_charges(self, ntile: int) -> int:
         """
         Calculate the charges upon this visitor. n_tile is the number of same-
         color tiles owned by the owner of this tile (to be supplied by the
         Board class)
         """
         # Charges on the title
-        tile_fee = self.schedule_fee['title'].get(ntile, 0)
+        tile_fee = self.rent[ntile] if ntile < len(self.rent) else 0
         # Charges on the constructed properties
         construct_fee = \
-            self.construct_count['house'] * self.schedule_fee['house'] \
-            + self.construct_count['hotel'] * self.schedule_fee['hotel']
+            self.house * self.schedule_fee['house'] \
+            + self.hotel * self.schedule_fee['hotel']
 
         return tile_fee + construct_fee
 
@@ -165,21 +200,25 @@ class TileProperty(TilePurchasable):
                built
         
         """
-        if self.construct_count[contype] == capacity[contype]:
+        if getattr(self, contype) == capacity[contype]:
             return 0
 
-        self.construct_count[contype] += qty
+        setattr(self, contype, getattr(self, contype) + qty)
 
         return self.cost[contype] * qty
 
 
 class TileInfra(TilePurchasable):
+    __slots__ = ('name', 'idx', 'color', 'cost', 'schedule_fee', 'rent')
+
     def __init__(self, schema: dict):
         self.name = schema['name']
         self.idx = schema['idx']
         self.color = schema['color']
         self.cost = schema['cost']
         self.schedule_fee = schema['schedule']
+        self.rent = schema['rent'] if 'rent' in schema \
+            else rent_table(self.schedule_fee['title'])
         self.owner = None
     
     def liquidate_title(self) -> int:
@@ -196,30 +235,35 @@ class TileInfra(TilePurchasable):
         self.owner = name
         return self.cost['title']
 
-    def get_charges(self, n_tile: str) -> int:
+    def get_charges(self, n_tile: int) -> int:
         """
         Calculate the charges upon this visitor. n_tile is the number of same-
         color tiles owned by the owner of this tile (to be supplied by the
         Board class)
         """
-        return self.schedule_fee['title'].get(n_tile, 0)
+        return self.rent[n_tile] if n_tile < len(self.rent) else 0
 
 
 class TileEvent(Tile):
+    __slots__ = ('name', 'idx')
+
     def __init__(self, schema: dict):
         self.name = schema['name']
         self.idx = schema['idx']
 
 class TileIncomeTax(TileEvent):
+    __slots__ = ('action',)
+
     def __init__(self, schema: dict):
         super().__init__(schema)
         self.action = schema['pay']
 
-    def get_action(self) -> list:
+    def get_action(self, visitor: Optional[str]=None) -> list:
         """
         Pay to bank the specified amount
         """
-        return [tuple([{'pay': self.action}])]
+        return super().get_action() + \
+            [Action('pay', {'payee': None, 'amt': self.get_charges()})]
 
     def get_charges(self):
         """
@@ -229,15 +273,18 @@ class TileIncomeTax(TileEvent):
 
 
 class TileSuperTax(TileEvent):
+    __slots__ = ('action',)
+
     def __init__(self, schema: dict):
         super().__init__(schema)
         self.action = schema['pay']
 
-    def get_action(self) -> list:
+    def get_action(self, visitor: Optional[str]=None) -> list:
         """
         Pay to bank the specified amount
         """
-        return [tuple([{'pay': self.action}])]
+        return super().get_action() + \
+            [Action('pay', {'payee': None, 'amt': self.get_charges()})]
 
     def get_charges(self):
         """
@@ -246,76 +293,101 @@ class TileSuperTax(TileEvent):
         return 750
 
 class TileGO(TileEvent):
+    __slots__ = ('action',)
+
     def __init__(self, schema: dict):
         super().__init__(schema)
         self.action = schema['receive']
 
-    def get_action(self) -> list:
+    def get_action(self, visitor: Optional[str]=None) -> list:
         """
-        Pay to bank the specified amount
+        Receive the specified amount from the bank
         """
-        return [tuple([{'pay': -self.action}])]
+        return super().get_action() + \
+            [Action('receive', {'amt': self.action['bank']})]
 
 
 class TileGoToJail(TileEvent):
+    __slots__ = ('action',)
+
     def __init__(self, schema: dict):
         super().__init__(schema)
         self.action = schema['move']
 
-    def get_action(self) -> list:
+    def get_action(self, visitor: Optional[str]=None) -> list:
         """
-        Pay to bank the specified amount
+        Send the visitor to jail
         """
-        return [tuple([{'move': self.action}])]
+        return super().get_action() + [Action('move', {'jail': True})]
 
 
 class TileEventDeck(TileEvent):
     """
     Chance, Community Chest, Taxes, Go To Jail, GO
+    Cards are drawn by moving the top of the deck along a preshuffled list,
+    wrapping around once the last card is drawn. With reshuffle set, the
+    deck is shuffled again every time it wraps around
     """
-    def __init__(self):
+    __slots__ = ('fpath', 'schema', 'deck', 'top', 'reshuffle', 'rng')
+
+    def __init__(
+            self, rng: Optional[random.Random]=None, reshuffle: bool=False):
+        self.rng = rng or random.Random()
+        self.reshuffle = reshuffle
         self._load_schema()
 
         # Load the cards into a deck
         self.deck = [card_idx for card_idx in self.schema]
         self._shuffle_deck()
+        # Position of the next card to be drawn
+        self.top = 0
 
     def _load_schema(self) -> None:
         """
         Load schema from json file
         """
-        with open(self.fpath, 'r') as f:
-            self.schema = json.load(f)
+        self.schema = load_card_schema(self.fpath)
 
     def _shuffle_deck(self) -> None:
         """
         Shuffle the order of the cards in the deck
         """
-        random.shuffle(self.deck)
+        self.rng.shuffle(self.deck)
 
-    def get_action(self) -> list:
+    def get_action(self, visitor: Optional[str]=None) -> list:
         """
         Draw a card from the deck for the given player
         """
-        drawn = self.deck.pop(0)
-        # Move to the bottom of the deck
-        self.deck.append(drawn)
+        drawn = self.deck[self.top]
+        # Advance the pointer past the drawn card, wrapping round the ring
+        self.top += 1
+        if self.top == len(self.deck):
+            self.top = 0
+            if self.reshuffle:
+                self._shuffle_deck()
 
-        return [tuple([{'draw': self.schema[drawn]}])]
+        return super().get_action() + \
+            [Action('draw', {'card': self.schema[drawn]})]
 
 
 class TileChance(TileEventDeck):
-    def __init__(self):
+    __slots__ = ()
+
+    def __init__(
+            self, rng: Optional[random.Random]=None, reshuffle: bool=False):
         self.name = 'Chance'
         self.fpath = os.path.join(DATADIR, 'schema_chance.json')
-        super().__init__()
+        super().__init__(rng, reshuffle)
 
 
 class TileCommunityChest(TileEventDeck):
-    def __init__(self):
+    __slots__ = ()
+
+    def __init__(
+            self, rng: Optional[random.Random]=None, reshuffle: bool=False):
         self.name = 'Community Chest'
         self.fpath = os.path.join(DATADIR, 'schema_chest.json')
-        super().__init__()
+        super().__init__(rng, reshuffle)
 
 
 class EventFactory:
@@ -338,11 +410,11 @@ class TileStatic(Tile):
     """
     Free Parking, Jail - Just Visiting
     """
+    __slots__ = ('name', 'idx')
+
     def __init__(self, schema: dict):
         self.name = schema['name']
-
-    def get_action(self, token: str) -> None:
-        return None
+        self.idx = schema['idx']
 
 
 class TileFactory:
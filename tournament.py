@@ -0,0 +1,216 @@
+import math
+import os
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from statistics import NormalDist
+from typing import Dict, Optional
+
+from simulation import play_game
+
+
+# Games of a pairing so far. score is the total score of one against two,
+# 1 per win and 0.5 per game without a winner
+Pairing = namedtuple('Pairing', ['one', 'two', 'games', 'score', 'decided'])
+
+# Rating of an agent on the Elo scale, with its confidence interval
+Rating = namedtuple('Rating', ['elo', 'low', 'high', 'games'])
+
+
+def seating(one, two, seed: int, seats: int=2) -> tuple:
+    """
+    Tokens of the seats, in turn order, and the agent at each. The agents
+    alternate around the table, one moving first in even games and two in
+    odd games
+    """
+    first, second = (one, two) if seed % 2 == 0 else (two, one)
+    lst_token = [f'p{i}' for i in range(seats)]
+    agents = {
+        token: first if i % 2 == 0 else second
+        for i, token in enumerate(lst_token)}
+
+    return lst_token, agents
+
+
+def play_match(
+        schema: dict, one, two, seed: int, seats: int=2,
+        max_turns: int=1000) -> float:
+    """
+    Score of agent one in a game against agent two, seated as by seating.
+    The seats take turns in order, so that the first move alternates
+    between the agents and the first-mover advantage cancels out
+    """
+    lst_token, agents = seating(one, two, seed, seats)
+    result = play_game(
+        lst_token, schema, seed, max_turns, agents=agents,
+        turn_order=lst_token)
+    if result.winner is None:
+        return 0.5
+
+    one_first = seed % 2 == 0
+    return float((lst_token.index(result.winner) % 2 == 0) == one_first)
+
+
+def bradley_terry(
+        names: list, pairings: list, iterations: int=200) -> Dict[str, tuple]:
+    """
+    Fit the strength of each agent to the pairing scores, returning the log
+    strength of each agent and its standard error. Each pairing counts one
+    extra drawn game, which keeps the fit finite for clean sweeps
+    """
+    index = {name: i for i, name in enumerate(names)}
+    games = [[0.] * len(names) for _ in names]
+    score = [[0.] * len(names) for _ in names]
+    for p in pairings:
+        i, j = index[p.one], index[p.two]
+        games[i][j] += p.games + 1
+        games[j][i] += p.games + 1
+        score[i][j] += p.score + 0.5
+        score[j][i] += p.games - p.score + 0.5
+
+    # Minorization-maximization updates
+    strength = [1.] * len(names)
+    for _ in range(iterations):
+        for i in range(len(names)):
+            denominator = sum(
+                games[i][j] / (strength[i] + strength[j])
+                for j in range(len(names)) if games[i][j])
+            if denominator:
+                strength[i] = sum(score[i]) / denominator
+        mean = math.exp(sum(math.log(s) for s in strength) / len(strength))
+        strength = [s / mean for s in strength]
+
+    fit = {}
+    for i, name in enumerate(names):
+        information = sum(
+            games[i][j] * strength[i] * strength[j] /
+            (strength[i] + strength[j]) ** 2
+            for j in range(len(names)) if games[i][j])
+        fit[name] = (
+            math.log(strength[i]),
+            1 / math.sqrt(information) if information else math.inf)
+
+    return fit
+
+
+class Tournament:
+    """
+    Round-robin tournament between agents, given by name as for Board. Each
+    pairing plays batches of games in parallel until its score is decided
+    at the confidence level, or max_games are played. The score is tested
+    against a draw after every batch from min_games on. As the test is
+    repeated, the error rate 1 - confidence is spent across the tests by
+    the Pocock-type spending function of Lan and DeMets, so that the chance
+    of deciding an even pairing stays within it. Options:
+        seats: players per game, seated alternately from the two agents
+        batch_size: games per pairing submitted per round
+        confidence: level of the early stopping test and of the ratings
+    """
+    def __init__(
+            self, agents: dict, schema: dict, seed: int=0, seats: int=2,
+            min_games: int=20, max_games: int=400, batch_size: int=20,
+            confidence: float=0.99, max_turns: int=1000,
+            max_workers: Optional[int]=None) -> None:
+        self.agents = agents
+        self.schema = schema
+        self.seed = seed
+        self.seats = seats
+        self.min_games = min_games
+        self.max_games = max_games
+        self.batch_size = batch_size
+        self.confidence = confidence
+        self.max_turns = max_turns
+        self.max_workers = max_workers or os.cpu_count()
+
+        self.pairings = {
+            (one, two): Pairing(one, two, 0, 0., False)
+            for one, two in combinations(agents, 2)}
+
+    @property
+    def z(self) -> float:
+        return NormalDist().inv_cdf((1 + self.confidence) / 2)
+
+    def alpha_spent(self, games: int) -> float:
+        """
+        Error rate spent by the tests up to the given number of games
+        """
+        fraction = min(games / self.max_games, 1.)
+
+        return (1 - self.confidence) * math.log(1 + (math.e - 1) * fraction)
+
+    def is_decided(self, games: int, score: float, previous: int=0) -> bool:
+        """
+        Whether the mean score of a pairing is away from a draw, given the
+        number of games at the previous test of the pairing. The test spends
+        the error rate left over since the previous test
+        """
+        if games < self.min_games:
+            return False
+
+        # No test took place before min_games
+        if previous < self.min_games:
+            previous = 0
+        alpha = self.alpha_spent(games) - self.alpha_spent(previous)
+        if alpha <= 0:
+            return False
+        z = NormalDist().inv_cdf(1 - alpha / 2)
+
+        mean = score / games
+        # Variance of the score, at least that of a single decisive game
+        variance = max(mean * (1 - mean), 1 / games)
+
+        return abs(mean - 0.5) > z * math.sqrt(variance / games)
+
+    def run(self) -> Dict[str, Rating]:
+        """
+        Play the pairings until all are decided or capped, and return the
+        ratings
+        """
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                open_pairings = [
+                    p for p in self.pairings.values()
+                    if not p.decided and p.games < self.max_games]
+                if not open_pairings:
+                    break
+
+                futures = {}
+                for p in open_pairings:
+                    n = min(self.batch_size, self.max_games - p.games)
+                    futures[(p.one, p.two)] = [
+                        executor.submit(
+                            play_match, self.schema, self.agents[p.one],
+                            self.agents[p.two], self.seed + p.games + i,
+                            self.seats, self.max_turns)
+                        for i in range(n)]
+
+                for key, lst_future in futures.items():
+                    p = self.pairings[key]
+                    games = p.games + len(lst_future)
+                    score = p.score + sum(f.result() for f in lst_future)
+                    self.pairings[key] = Pairing(
+                        p.one, p.two, games, score,
+                        self.is_decided(games, score, p.games))
+
+        return self.ratings()
+
+    def ratings(self) -> Dict[str, Rating]:
+        """
+        Elo ratings of the agents from the games played so far, centered on
+        1500
+        """
+        names = list(self.agents)
+        fit = bradley_terry(names, list(self.pairings.values()))
+        scale = 400 / math.log(10)
+
+        ratings = {}
+        for name, (strength, error) in fit.items():
+            elo = 1500 + scale * strength
+            margin = self.z * scale * error
+            games = sum(
+                p.games for p in self.pairings.values()
+                if name in (p.one, p.two))
+            ratings[name] = Rating(elo, elo - margin, elo + margin, games)
+
+        return ratings
@@ -0,0 +1,98 @@
+import numpy as np
+
+from common import dice_faces
+
+
+class BatchMover:
+    """
+    Dice and movement engine for B games played in lockstep. Positions, round
+    counts and jail flags of every player in every game are held in arrays of
+    shape (B, n_players), and each call to step plays one turn in all games
+
+    The rules follow Board.roll_till_move and Board.play_next_turn:
+        1. Doubles earn a reroll, and the third double in a row sends the
+           player to jail
+        2. Landing on the Go To Jail tile sends the player to jail
+        3. A jailed player sits out one turn
+    """
+    def __init__(
+            self, n_games: int, n_players: int, dice_type: str='hexa',
+            n: int=2, n_tiles: int=40, jail_idx: int=10,
+            go_to_jail_idx: int=30, seed=None):
+        self.n_games = n_games
+        self.n_players = n_players
+        self.n_faces = dice_faces[dice_type]
+        self.dice_count = n
+        self.n_tiles = n_tiles
+        self.jail_idx = jail_idx
+        self.go_to_jail_idx = go_to_jail_idx
+
+        self.rng = np.random.default_rng(seed)
+
+        self.position = np.zeros((n_games, n_players), dtype=np.int64)
+        self.nround = np.ones((n_games, n_players), dtype=np.int64)
+        self.jail = np.zeros((n_games, n_players), dtype=bool)
+        # Index of the player taking the next turn in each game
+        self.turn = np.zeros(n_games, dtype=np.int64)
+        # Number of times a turn ended on each tile, across all games
+        self.landings = np.zeros(n_tiles, dtype=np.int64)
+
+        self._games = np.arange(n_games)
+
+    def roll(self) -> tuple:
+        """
+        Roll the full doubles/reroll/third-strike sequence for every game.
+        Returns the total steps and whether the player goes to jail
+        """
+        dice = self.rng.integers(
+            1, self.n_faces + 1, size=(self.n_games, 3, self.dice_count))
+        sums = dice.sum(axis=2)
+        doubles = (dice == dice[:, :, :1]).all(axis=2)
+
+        # A roll only counts if every roll before it was a double
+        used = np.ones((self.n_games, 3), dtype=bool)
+        used[:, 1] = doubles[:, 0]
+        used[:, 2] = doubles[:, 0] & doubles[:, 1]
+
+        steps = (sums * used).sum(axis=1)
+        to_jail = doubles.all(axis=1)
+
+        return steps, to_jail
+
+    def step(self) -> None:
+        """
+        Play one turn in every game
+        """
+        games, players = self._games, self.turn
+        steps, to_jail = self.roll()
+
+        # Players in jail sit out this turn and are released
+        jailed = self.jail[games, players]
+        self.jail[games, players] = False
+        moving = ~jailed
+
+        new_position = self.position[games, players] + steps
+        # Count a round when moving past the GO tile
+        self.nround[games, players] += \
+            (new_position // self.n_tiles) * (moving & ~to_jail)
+        new_position %= self.n_tiles
+
+        to_jail = moving & (to_jail | (new_position == self.go_to_jail_idx))
+        new_position[to_jail] = self.jail_idx
+        self.jail[games, players] = to_jail
+
+        new_position = np.where(
+            moving, new_position, self.position[games, players])
+        self.position[games, players] = new_position
+
+        self.landings += np.bincount(new_position, minlength=self.n_tiles)
+        self.turn = (self.turn + 1) % self.n_players
+
+    def run(self, n_turns: int) -> np.ndarray:
+        """
+        Play n_turns turns in every game. Returns the landing counts
+        """
+        for _ in range(n_turns):
+            self.step()
+
+        return self.landings